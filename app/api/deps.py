@@ -1,17 +1,22 @@
 """API dependencies for dependency injection."""
 
-import json
+import hashlib
 from collections.abc import Generator
+from datetime import UTC, datetime
 from typing import Annotated
 
+import orjson
 from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import raiseload
 from sqlmodel import Session, select
 
 from app.database import get_session
 from app.models.user import User, UserSettings
-from app.utils import get_custom_tags
+from app.schemas.auth import TokenData
 from app.utils.auth import decode_access_token
+from app.utils.cache import TTLCache
 from app.utils.exceptions import AuthenticationError
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
@@ -25,6 +30,107 @@ def get_db() -> Generator[Session, None, None]:
 SessionDep = Annotated[Session, Depends(get_db)]
 
 
+# Verified token payloads keyed by the token's SHA-256 digest, so repeated
+# HTMX requests with the same cookie skip signature verification
+_TOKEN_CACHE_TTL = 30.0
+_token_cache: TTLCache[bytes, TokenData] = TTLCache(
+    maxsize=10_000, ttl=_TOKEN_CACHE_TTL
+)
+
+
+def _token_cache_key(access_token: str) -> bytes:
+    """Key cached token payloads by digest rather than by the secret itself."""
+    return hashlib.sha256(access_token.encode()).digest()
+
+
+def decode_cookie_token(access_token: str) -> TokenData:
+    """
+    Decode an access token, reusing recently verified results.
+
+    Entries never outlive the token's own expiry.
+
+    Args:
+        access_token: JWT string from the cookie
+
+    Returns:
+        TokenData for the token
+
+    Raises:
+        AuthenticationError: If token is invalid or expired
+    """
+    key = _token_cache_key(access_token)
+    token_data = _token_cache.get(key)
+    if token_data is None:
+        token_data = decode_access_token(access_token)
+        ttl = _TOKEN_CACHE_TTL
+        if token_data.expires_at is not None:
+            remaining = (token_data.expires_at - datetime.now(UTC)).total_seconds()
+            ttl = min(ttl, remaining)
+        if ttl > 0:
+            _token_cache.set(key, token_data, ttl=ttl)
+    return token_data
+
+
+# Detached users keyed by ID, so authenticated requests skip the user SELECT.
+# Invalidation only reaches the current worker, so other workers may serve a
+# copy up to the TTL old: read settings and API tokens from the database.
+# Cached objects are shared between requests: never modify them, write
+# through UPDATE statements and invalidate instead.
+_user_cache: TTLCache[int, User] = TTLCache(maxsize=5000, ttl=10.0)
+
+
+def invalidate_cached_user(user_id: int | None) -> None:
+    """
+    Drop a user from the request cache after changing their row.
+
+    Args:
+        user_id: ID of the modified user
+    """
+    if user_id is not None:
+        _user_cache.pop(user_id)
+
+
+def forget_cookie_token(access_token: str | None) -> None:
+    """
+    Drop cached auth state for a cookie token, e.g. on logout.
+
+    Args:
+        access_token: JWT string from the cookie, if any
+    """
+    if not access_token:
+        return
+    token_data = _token_cache.pop(_token_cache_key(access_token))
+    if token_data is not None:
+        invalidate_cached_user(token_data.user_id)
+
+
+def load_user(session: Session, user_id: int) -> User | None:
+    """
+    Load a user, reusing a recently cached detached copy.
+
+    Args:
+        session: Database session
+        user_id: User ID from the token
+
+    Returns:
+        User instance, or None if the user no longer exists
+    """
+    user = _user_cache.get(user_id)
+    if user is None:
+        # Settings are not loaded, so they are never served from the cache
+        statement = (
+            select(User)
+            .options(raiseload(User.settings))  # type: ignore[arg-type]
+            .where(User.id == user_id)
+        )
+        user = session.exec(statement).first()
+        if user is None:
+            return None
+        session.expunge(user)
+        _user_cache.set(user_id, user)
+    return user
+
+
 def get_current_user(
     session: SessionDep,
     token: Annotated[str | None, Depends(oauth2_scheme)],
@@ -109,6 +215,9 @@ def get_user_settings(
     """
     Get the current user's settings.
 
+    Always read from the database rather than from the (possibly cached)
+    user, so changes made through another worker are seen immediately.
+
     Args:
         session: Database session
         current_user: Authenticated user
@@ -121,11 +230,18 @@ def get_user_settings(
     settings = session.exec(statement).first()
 
     if not settings:
-        # Create default settings for user
-        settings = UserSettings(user_id=current_user.id)
-        session.add(settings)
+        # Create default settings in one round trip; a concurrent request may
+        # have inserted the row already, in which case nothing is returned
+        insert_statement = (
+            sqlite_insert(UserSettings)
+            .values(user_id=current_user.id)
+            .on_conflict_do_nothing(index_elements=["user_id"])
+            .returning(UserSettings)
+        )
+        settings = session.scalars(insert_statement).first()
         session.commit()
-        session.refresh(settings)
+        if not settings:
+            settings = session.exec(statement).one()
 
     return settings
 
@@ -143,7 +259,7 @@ def get_user_tags(user_settings: UserSettingsDep) -> list[str]:
     Returns:
         List of tag strings
     """
-    return get_custom_tags(user_settings.custom_tags)
+    return user_settings.custom_tags_list
 
 
 UserTagsDep = Annotated[list[str], Depends(get_user_tags)]
@@ -187,7 +303,7 @@ def _update_user_settings(
         user_settings.ollama_api_key = ollama_api_key
 
     if custom_tags is not None:
-        user_settings.custom_tags = json.dumps(custom_tags)
+        user_settings.custom_tags = orjson.dumps(custom_tags).decode()
 
     if homeassistant_url is not None:
         user_settings.homeassistant_url = homeassistant_url
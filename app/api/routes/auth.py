@@ -7,11 +7,12 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import select
 
-from app.api.deps import CurrentUserDep, SessionDep
+from app.api.deps import CurrentUserDep, SessionDep, invalidate_cached_user
 from app.models.user import User, UserSettings
 from app.schemas.auth import ApiTokenResponse, Token, UserCreate, UserResponse
 from app.utils.auth import (
     create_access_token,
+    get_dummy_password_hash,
     get_password_hash,
     verify_password,
 )
@@ -42,17 +43,17 @@ def register(user_data: UserCreate, session: SessionDep) -> Token:
         hashed_password=hashed_password,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    session.flush()
 
-    # Create default settings for the user
-    assert user.id is not None
-    settings = UserSettings(user_id=user.id)
+    # Create default settings for the user in the same transaction
+    user_id = user.id
+    assert user_id is not None
+    settings = UserSettings(user_id=user_id)
     session.add(settings)
     session.commit()
 
-    # Generate token
-    access_token = create_access_token(user.id)
+    # Generate token (user_id was read before commit expired the instance)
+    access_token = create_access_token(user_id)
     return Token(access_token=access_token)
 
 
@@ -65,11 +66,17 @@ def login(
 
     Returns JWT token on successful authentication.
     """
-    # Find user by username
-    statement = select(User).where(User.username == form_data.username)
-    user = session.exec(statement).first()
+    # Find user by username, loading only the columns needed to log in
+    statement = select(User.id, User.hashed_password).where(
+        User.username == form_data.username
+    )
+    row = session.exec(statement).first()
+
+    # Verify against a dummy hash for unknown users to keep timing uniform
+    user_id, hashed_password = row if row else (None, get_dummy_password_hash())
+    password_ok = verify_password(form_data.password, hashed_password)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if user_id is None or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -77,8 +84,7 @@ def login(
         )
 
     # Generate token
-    assert user.id is not None
-    access_token = create_access_token(user.id)
+    access_token = create_access_token(user_id)
     return Token(access_token=access_token)
 
 
@@ -103,10 +109,10 @@ def generate_api_token(
     # Generate a new secure token
     api_token = secrets.token_urlsafe(32)
 
-    # Update user's API token
+    # Update user's API token; the user is already tracked by this session
     current_user.api_token = api_token
-    session.add(current_user)
     session.commit()
+    invalidate_cached_user(current_user.id)
 
     return ApiTokenResponse(api_token=api_token)
 
@@ -117,5 +123,5 @@ def revoke_api_token(current_user: CurrentUserDep, session: SessionDep) -> None:
     Revoke the current API token.
     """
     current_user.api_token = None
-    session.add(current_user)
     session.commit()
+    invalidate_cached_user(current_user.id)
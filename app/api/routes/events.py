@@ -1,3 +1,4 @@
+import asyncio
 from typing import cast
 
 from fastapi import APIRouter, Cookie, Request
@@ -5,6 +6,7 @@ from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 
 from app.api.routes.web import get_current_user_from_cookie
+from app.database import engine
 from app.utils.events import event_manager
 
 router = APIRouter(tags=["events"])
@@ -17,10 +19,10 @@ async def events_endpoint(
 ):
     """SSE endpoint for real-time updates."""
     # We need a session to get the user
-    from app.database import engine
-
     with Session(engine) as session:
-        user = await get_current_user_from_cookie(request, session, access_token)
+        user = await asyncio.to_thread(
+            get_current_user_from_cookie, request, session, access_token
+        )
         if not user:
             return StreamingResponse(
                 iter(["event: error\ndata: unauthorized\n\n"]),
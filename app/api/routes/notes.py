@@ -1,8 +1,10 @@
 """Notes CRUD endpoints."""
 
-import uuid
+import asyncio
+import secrets
+import shutil
 from pathlib import Path
-from typing import Annotated, cast
+from typing import Annotated, BinaryIO, cast
 
 from fastapi import (
     APIRouter,
@@ -35,6 +37,13 @@ UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
 
+def _save_upload(source: BinaryIO, destination: Path) -> None:
+    """Copy an uploaded file to disk in fixed-size chunks."""
+    source.seek(0)
+    with open(destination, "wb") as f:
+        shutil.copyfileobj(source, f, length=1024 * 1024)
+
+
 @router.post(
     "/upload", response_model=NoteResponse, status_code=status.HTTP_202_ACCEPTED
 )
@@ -53,17 +62,14 @@ async def upload_voice_note(
     assert current_user.id is not None
     note_service = NoteService(session)
 
-    # Read file content
-    content = await audio_file.read()
-
     # Generate unique filename
     file_extension = Path(audio_file.filename or "audio.m4a").suffix or ".m4a"
-    unique_filename = f"{uuid.uuid4()}{file_extension}"
+    unique_filename = f"{secrets.token_hex(16)}{file_extension}"
     file_path = UPLOAD_DIR / unique_filename
 
-    # Save to disk
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Save to disk in chunks on a worker thread, so large recordings are
+    # neither held in memory nor written on the event loop
+    await asyncio.to_thread(_save_upload, audio_file.file, file_path)
 
     # Create note with pending status
     note = note_service.create_note(
@@ -2,14 +2,18 @@
 
 from fastapi import APIRouter
 
-from app.api.deps import SessionDep, UserSettingsDep, _update_user_settings
+from app.api.deps import (
+    SessionDep,
+    UserSettingsDep,
+    _update_user_settings,
+    invalidate_cached_user,
+)
 from app.schemas.settings import (
     ModelsResponse,
     UserSettingsResponse,
     UserSettingsUpdate,
 )
 from app.services.ollama_service import OllamaService
-from app.utils import get_custom_tags
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
@@ -19,7 +23,7 @@ def get_settings(user_settings: UserSettingsDep) -> UserSettingsResponse:
     """
     Get the current user's settings.
     """
-    custom_tags = get_custom_tags(user_settings.custom_tags)
+    custom_tags = user_settings.custom_tags_list
 
     return UserSettingsResponse(
         ollama_url=user_settings.ollama_url,
@@ -54,11 +58,11 @@ def update_settings(
         homeassistant_device=update_data.homeassistant_device,
     )
 
-    session.add(user_settings)
     session.commit()
     session.refresh(user_settings)
+    invalidate_cached_user(user_settings.user_id)
 
-    custom_tags = get_custom_tags(user_settings.custom_tags)
+    custom_tags = user_settings.custom_tags_list
 
     return UserSettingsResponse(
         ollama_url=user_settings.ollama_url,
@@ -81,5 +85,5 @@ async def get_available_models(user_settings: UserSettingsDep) -> ModelsResponse
         base_url=user_settings.ollama_url,
         api_key=user_settings.ollama_api_key,
     )
-    models = await ollama.get_available_models()
+    models = await ollama.get_available_models_cached()
     return ModelsResponse(models=models)
@@ -1,34 +1,85 @@
 """Web routes for HTMX frontend - package exports."""
 
-import json
 import logging
+from datetime import UTC, datetime
+from typing import Annotated
 
-from fastapi import APIRouter, Request
-from fastapi.responses import RedirectResponse
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemLoader
 from sqlmodel import Session
 
-from app.models.user import User
-from app.utils.auth import create_access_token, decode_access_token
+from app.api.deps import (
+    SessionDep,
+    decode_cookie_token,
+    get_user_settings,
+    load_user,
+)
+from app.config import settings as app_settings
+from app.models.user import User, UserSettings
+from app.utils.auth import create_access_token
 from app.utils.exceptions import AuthenticationError
+from app.utils.static import static_url
 
 router = APIRouter(tags=["web"])
 logger = logging.getLogger(__name__)
-templates = Jinja2Templates(directory="app/templates")
+# The template set is small and fixed, so keep every compiled template and
+# only check files for changes while developing
+templates = Jinja2Templates(
+    env=Environment(
+        loader=FileSystemLoader("app/templates"),
+        autoescape=True,
+        auto_reload=app_settings.debug,
+        cache_size=-1,
+    )
+)
 
 
 def from_json(value):
-    """Parse JSON string to Python object."""
+    """Parse JSON string to Python object, passing parsed values through."""
+    if not isinstance(value, str | bytes):
+        return value
     try:
-        return json.loads(value) if isinstance(value, str) else value
-    except json.JSONDecodeError:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
         return value
 
 
 templates.env.filters["from_json"] = from_json
+templates.env.globals["now"] = lambda: datetime.now(UTC)
+templates.env.globals["static_url"] = static_url
+
+
+def render(name: str, context: dict, status_code: int = 200) -> HTMLResponse:
+    """
+    Render a template straight into an HTMLResponse.
+
+    A lighter stand-in for ``templates.TemplateResponse``: it skips the
+    per-call signature handling (and the deprecation warning our
+    dict-with-request call style triggers) and the debug hooks.
+
+    Args:
+        name: Template name
+        context: Template context, including ``request``
+        status_code: HTTP status code
+
+    Returns:
+        HTMLResponse with the rendered template
+    """
+    return HTMLResponse(
+        templates.get_template(name).render(context), status_code=status_code
+    )
 
 
-async def get_current_user_from_cookie(
+def precompile_templates() -> None:
+    """Parse and compile every template up front so first renders are fast."""
+    for name in templates.env.list_templates():
+        templates.env.get_template(name)
+
+
+def get_current_user_from_cookie(
     _request: Request,
     session: Session,
     access_token: str | None,
@@ -38,15 +89,105 @@ async def get_current_user_from_cookie(
         return None
 
     try:
-        token_data = decode_access_token(access_token)
+        token_data = decode_cookie_token(access_token)
         if token_data.user_id is None:
             return None
-        user = session.get(User, token_data.user_id)
-        return user
+        return load_user(session, token_data.user_id)
     except AuthenticationError:
         return None
 
 
+def get_cookie_user(request: Request, session: SessionDep) -> User | None:
+    """
+    Dependency resolving the user from the ``access_token`` cookie.
+
+    Reads the cookie from Starlette's already-parsed ``request.cookies``
+    rather than declaring a ``Cookie`` parameter on every route.
+
+    Args:
+        request: FastAPI Request object
+        session: Database session
+
+    Returns:
+        Authenticated User, or None if the cookie is missing or invalid
+    """
+    return get_current_user_from_cookie(
+        request, session, request.cookies.get("access_token")
+    )
+
+
+CookieUserDep = Annotated[User | None, Depends(get_cookie_user)]
+
+
+def get_cookie_user_settings(
+    session: SessionDep, user: CookieUserDep
+) -> UserSettings | None:
+    """
+    Dependency resolving the cookie user's settings.
+
+    Shares the per-request ``get_cookie_user`` result but reads the settings
+    row itself, since the user may come from the cache.
+
+    Args:
+        session: Database session
+        user: User from the cookie, if any
+
+    Returns:
+        UserSettings for the user, or None if not authenticated
+    """
+    if user is None:
+        return None
+    return get_user_settings(session, user)
+
+
+CookieUserSettingsDep = Annotated[
+    UserSettings | None, Depends(get_cookie_user_settings)
+]
+
+
+async def require_cookie_user(user: CookieUserDep) -> User:
+    """
+    Dependency requiring an authenticated cookie user.
+
+    HTMX fragment routes use this instead of checking for a user themselves;
+    the client redirects to the login page on a 401 response.
+
+    Args:
+        user: User from the cookie, if any
+
+    Returns:
+        Authenticated User
+
+    Raises:
+        HTTPException: If the request is not authenticated
+    """
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
+        )
+    return user
+
+
+WebUserDep = Annotated[User, Depends(require_cookie_user)]
+
+
+def require_cookie_user_settings(session: SessionDep, user: WebUserDep) -> UserSettings:
+    """
+    Dependency requiring an authenticated cookie user and their settings.
+
+    Args:
+        session: Database session
+        user: Authenticated user
+
+    Returns:
+        UserSettings for the user
+    """
+    return get_user_settings(session, user)
+
+
+WebUserSettingsDep = Annotated[UserSettings, Depends(require_cookie_user_settings)]
+
+
 def require_user_id(user: User | None) -> int:
     """
     Get user ID from user object, raising an error if user is None or ID is missing.
@@ -69,8 +210,6 @@ def require_user_id(user: User | None) -> int:
 
 def create_auth_response(user_id: int, redirect_url: str = "/") -> RedirectResponse:
     """Create a redirect response with authentication cookie."""
-    from app.config import settings
-
     access_token = create_access_token(user_id)
     response = RedirectResponse(url=redirect_url, status_code=303)
     response.set_cookie(
@@ -6,41 +6,50 @@ from fastapi import Form, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from sqlmodel import select
 
-from app.api.deps import SessionDep
+from app.api.deps import SessionDep, forget_cookie_token
 from app.models.user import User, UserSettings
-from app.utils.auth import get_password_hash, verify_password
+from app.utils.auth import (
+    get_dummy_password_hash,
+    get_password_hash,
+    verify_password,
+)
 
 from . import (
     create_auth_response,
     get_current_user_from_cookie,
+    render,
     require_user_id,
     router,
-    templates,
 )
 
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request, error: str | None = None):
     """Render login page."""
-    return templates.TemplateResponse(
+    return render(
         "login.html",
         {"request": request, "error": error, "current_user": None},
     )
 
 
 @router.post("/login")
-async def login_submit(
+def login_submit(
     request: Request,
     session: SessionDep,
     username: Annotated[str, Form()],
     password: Annotated[str, Form()],
 ):
     """Handle login form submission."""
-    statement = select(User).where(User.username == username)
-    user = session.exec(statement).first()
+    # Only the columns needed to log in, without the joined settings row
+    statement = select(User.id, User.hashed_password).where(User.username == username)
+    row = session.exec(statement).first()
+
+    # Always run bcrypt so timing doesn't leak usernames
+    user_id, hashed_password = row if row else (None, get_dummy_password_hash())
+    password_ok = verify_password(password, hashed_password)
 
-    if not user or not verify_password(password, user.hashed_password):
-        return templates.TemplateResponse(
+    if user_id is None or not password_ok:
+        return render(
             "login.html",
             {
                 "request": request,
@@ -49,21 +58,20 @@ async def login_submit(
             },
         )
 
-    user_id = require_user_id(user)
     return create_auth_response(user_id)
 
 
 @router.get("/register", response_class=HTMLResponse)
 async def register_page(request: Request, error: str | None = None):
     """Render register page."""
-    return templates.TemplateResponse(
+    return render(
         "register.html",
         {"request": request, "error": error, "current_user": None},
     )
 
 
 @router.post("/register")
-async def register_submit(
+def register_submit(
     request: Request,
     session: SessionDep,
     username: Annotated[str, Form()],
@@ -71,7 +79,7 @@ async def register_submit(
 ):
     """Handle register form submission."""
     if session.exec(select(User).where(User.username == username)).first():
-        return templates.TemplateResponse(
+        return render(
             "register.html",
             {
                 "request": request,
@@ -80,10 +88,11 @@ async def register_submit(
             },
         )
 
-    user = User(username=username, hashed_password=get_password_hash(password))
+    hashed_password = get_password_hash(password)
+    user = User(username=username, hashed_password=hashed_password)
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    # Flush populates the primary key without a separate refresh SELECT
+    session.flush()
     user_id = require_user_id(user)
 
     settings = UserSettings(user_id=user_id)
@@ -94,8 +103,9 @@ async def register_submit(
 
 
 @router.get("/logout")
-async def logout():
+async def logout(request: Request):
     """Log out and clear cookie."""
+    forget_cookie_token(request.cookies.get("access_token"))
     response = RedirectResponse(url="/login", status_code=303)
     response.delete_cookie(key="access_token")
     return response
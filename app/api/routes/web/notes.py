@@ -1,26 +1,96 @@
 """Note web routes for HTMX frontend."""
 
-from datetime import UTC, datetime
+import re
+from collections.abc import AsyncIterator, Iterator
+from datetime import UTC, date, datetime, time
+from functools import lru_cache
 from typing import Annotated
 
-from fastapi import BackgroundTasks, Cookie, Form, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import BackgroundTasks, Form, Request
+from fastapi.responses import (
+    HTMLResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 
-from app.api.deps import SessionDep, get_user_settings
+from app.api.deps import SessionDep
+from app.models.note import Note
 from app.services.note_service import NoteService
 from app.tasks.processing_tasks import process_new_note
-from app.utils import get_custom_tags
+from app.utils.cache import TTLCache
 from app.utils.events import event_manager
 from app.utils.exceptions import NotFoundError
 
 from . import (
-    get_current_user_from_cookie,
+    CookieUserDep,
+    CookieUserSettingsDep,
+    WebUserDep,
+    WebUserSettingsDep,
     logger,
+    render,
     require_user_id,
     router,
     templates,
 )
 
+# Comma-separated ids; tokens that are not plain integers are ignored
+_NOTE_ID_RE = re.compile(r"(?:^|,)\s*(\d+)\s*(?=,|$)")
+# Upper bound on ids accepted by a single bulk action
+_MAX_BULK_IDS = 10_000
+
+# Appended when the recent notes stream fails after its first chunk was sent
+_RECENT_NOTES_ERROR_HTML = """
+<div class="col-span-full text-center py-4 px-3 rounded-lg bg-red-100 dark:bg-red-900/20">
+    <p class="text-xs font-medium text-red-600 dark:text-red-400">Error loading notes</p>
+</div>
+"""
+
+# Rendered card and status fragments keyed by template and note ETag
+_fragment_cache: TTLCache[tuple[str, str], bytes] = TTLCache(maxsize=2048, ttl=5)
+
+# Totals computed by the table body, reused by the pagination request the
+# page issues right after it settles
+_table_total_cache: TTLCache[tuple, int] = TTLCache(maxsize=1000, ttl=2)
+
+
+def _table_total_key(
+    user_id: int,
+    search: str | None,
+    tag: str | None,
+    status: str | None,
+    archive_filter: str,
+    date_from: str | None,
+    date_to: str | None,
+) -> tuple:
+    """Build the cache key for a notes table total from its filters."""
+    return (
+        user_id,
+        search or None,
+        tag if tag and tag != "all" else None,
+        status if status and status != "all" else None,
+        archive_filter,
+        date_from or None,
+        date_to or None,
+    )
+
+
+# archive_filter value -> (include_archived, archived_only)
+_ARCHIVE_FILTERS = {
+    "active": (False, False),
+    "all": (True, False),
+    "archived": (False, True),
+}
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value: str) -> date | None:
+    """Parse a ``YYYY-MM-DD`` filter date, returning None if invalid."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
 
 def _parse_table_filters(
     archive_filter: str,
@@ -28,103 +98,155 @@ def _parse_table_filters(
     date_to: str | None,
 ) -> tuple[tuple[bool, bool], datetime | None, datetime | None]:
     """Parse table filter parameters."""
-    if archive_filter == "active":
-        include_archived = False
-        archived_only = False
-    elif archive_filter == "all":
-        include_archived = True
-        archived_only = False
-    elif archive_filter == "archived":
-        include_archived = False
-        archived_only = True
-    else:
-        include_archived = False
-        archived_only = False
+    include_archived, archived_only = _ARCHIVE_FILTERS.get(
+        archive_filter, (False, False)
+    )
 
     parsed_date_from = None
     parsed_date_to = None
 
-    if date_from:
-        try:
-            parsed_date_from = datetime.strptime(date_from, "%Y-%m-%d").replace(
-                tzinfo=UTC
-            )
-        except ValueError:
-            pass
+    if date_from and (day := _parse_date(date_from)):
+        parsed_date_from = datetime.combine(day, time.min, tzinfo=UTC)
 
-    if date_to:
-        try:
-            parsed_date_to = datetime.strptime(date_to, "%Y-%m-%d").replace(
-                hour=23, minute=59, second=59, tzinfo=UTC
-            )
-        except ValueError:
-            pass
+    if date_to and (day := _parse_date(date_to)):
+        parsed_date_to = datetime.combine(day, time(23, 59, 59), tzinfo=UTC)
 
     return (include_archived, archived_only), parsed_date_from, parsed_date_to
 
 
+async def _stream_similar_notes(
+    request: Request, note_service: NoteService, note_id: int, user_id: int
+) -> AsyncIterator[str]:
+    """
+    Render similar note cards one chunk at a time.
+
+    Each note is rendered through the same template as a one-item list, so the
+    client can paint the first card before the rest have been read.
+    """
+    template = templates.get_template("components/similar_notes.html")
+    found = False
+    try:
+        async for note in note_service.iter_similar_notes(note_id, user_id, limit=5):
+            found = True
+            yield template.render(request=request, notes=[note])
+    except Exception as e:
+        logger.exception(f"Error in similar_notes: {e}")
+        yield template.render(request=request, notes=[], error=str(e))
+        return
+
+    if not found:
+        yield template.render(request=request, notes=[])
+
+
+def _note_etag(note: Note) -> str:
+    """Build a weak ETag that changes whenever the note's rendering can."""
+    version = int(note.updated_at.timestamp() * 1_000_000)
+    return f'W/"{note.id}-{version}-{note.processing_status}"'
+
+
+def _note_cache_headers(etag: str) -> dict[str, str]:
+    """Get revalidation headers for fragments polled during SSE updates."""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _render_note_fragment(name: str, etag: str, context: dict) -> HTMLResponse:
+    """
+    Render a note fragment, reusing recent output for the same note version.
+
+    SSE reconnects refetch cards and badges for notes that have not changed;
+    keying on the ETag means any change to the note renders afresh.
+    """
+    key = (name, etag)
+    body = _fragment_cache.get(key)
+    if body is None:
+        body = templates.get_template(name).render(context).encode()
+        _fragment_cache.set(key, body)
+    return HTMLResponse(content=body, headers=_note_cache_headers(etag))
+
+
+def _stream_template(
+    name: str, context: dict, error_html: str, chunk_size: int = 16_384
+) -> Iterator[str]:
+    """
+    Render a template incrementally, flushing roughly chunk_size characters.
+
+    Jinja yields many tiny fragments; batching them keeps the per-chunk send
+    overhead low while the first cards still reach the client early. This is
+    a sync generator, so Starlette renders each chunk in the threadpool
+    rather than on the event loop.
+
+    Once a chunk has been sent the response can no longer fall back to an
+    error page, so a rendering failure appends error_html instead.
+    """
+    buffer: list[str] = []
+    size = 0
+    try:
+        for fragment in templates.get_template(name).generate(context):
+            buffer.append(fragment)
+            size += len(fragment)
+            if size >= chunk_size:
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+    except Exception as e:
+        logger.exception(f"Error rendering {name}: {e}")
+        buffer = [error_html]
+    if buffer:
+        yield "".join(buffer)
+
+
 @router.get("/web/notes/{note_id}/similar", response_class=HTMLResponse)
 async def get_similar_notes_web(
     note_id: int,
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
 ):
     """Get similar notes for a note."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
     user_id = require_user_id(user)
 
-    user_settings = get_user_settings(session, user)
     note_service = NoteService(session)
 
     try:
         note = note_service.get_note(note_id, user_id)
         if note.processing_status != "completed":
-            return templates.TemplateResponse(
+            return render(
                 "components/similar_notes.html",
                 {"request": request, "notes": [], "processing": True},
             )
 
-        notes = await note_service.get_similar_notes(
-            note_id, user_id, user_settings, limit=5
-        )
-        return templates.TemplateResponse(
-            "components/similar_notes.html", {"request": request, "notes": notes}
+        return StreamingResponse(
+            _stream_similar_notes(request, note_service, note_id, user_id),
+            media_type="text/html",
         )
     except NotFoundError:
-        return HTMLResponse(content="", status_code=404)
+        return Response(status_code=404)
     except Exception as e:
         logger.exception(f"Error in similar_notes: {e}")
-        return templates.TemplateResponse(
+        return render(
             "components/similar_notes.html",
             {"request": request, "notes": [], "error": str(e)},
         )
 
 
 @router.get("/web/notes/{note_id}/edit/{field}", response_class=HTMLResponse)
-async def edit_note_field(
+def edit_note_field(
     note_id: int,
     field: str,
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
+    user_settings: WebUserSettingsDep,
 ):
     """Render inline edit form for a note field."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
-    user_settings = get_user_settings(session, user)
     note_service = NoteService(session)
 
     try:
         note = note_service.get_note(note_id, user_id)
-        available_tags = get_custom_tags(user_settings.custom_tags)
+        available_tags = user_settings.custom_tags_list
 
-        return templates.TemplateResponse(
+        return render(
             f"forms/edit_{field}.html",
             {"request": request, "note": note, "available_tags": available_tags},
         )
@@ -133,11 +255,11 @@ async def edit_note_field(
 
 
 @router.patch("/web/notes/{note_id}", response_class=HTMLResponse)
-async def update_note_web(
+def update_note_web(
     note_id: int,
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
     raw_transcript: Annotated[str | None, Form()] = None,
     summary: Annotated[str | None, Form()] = None,
     tag: Annotated[str | None, Form()] = None,
@@ -147,24 +269,18 @@ async def update_note_web(
 
     Returns the updated note card HTML for real-time updates.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
     try:
-        note_service.update_note(
+        note = note_service.update_note(
             note_id,
             user_id,
             raw_transcript=raw_transcript,
             summary=summary,
             tag=tag,
         )
-
-        note = note_service.get_note(note_id, user_id)
-        return templates.TemplateResponse(
+        return render(
             "components/note_card.html",
             {
                 "request": request,
@@ -181,20 +297,19 @@ async def update_note_web(
 
 
 @router.get("/web/notes/table", response_class=HTMLResponse)
-async def get_notes_table_page(
+def get_notes_table_page(
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: CookieUserDep,
+    user_settings: CookieUserSettingsDep,
 ):
     """Render all notes table page."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
+    if not user or not user_settings:
         return RedirectResponse(url="/login", status_code=303)
 
-    user_settings = get_user_settings(session, user)
-    custom_tags = get_custom_tags(user_settings.custom_tags)
+    custom_tags = user_settings.custom_tags_list
 
-    return templates.TemplateResponse(
+    return render(
         "notes_table.html",
         {
             "request": request,
@@ -205,10 +320,10 @@ async def get_notes_table_page(
 
 
 @router.get("/web/notes/table/data", response_class=HTMLResponse)
-async def get_notes_table_data(
+def get_notes_table_data(
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
     search: str | None = None,
     tag: str | None = None,
     status: str | None = None,
@@ -225,10 +340,6 @@ async def get_notes_table_data(
 
     Supports filtering, sorting, and pagination.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
@@ -251,11 +362,17 @@ async def get_notes_table_data(
             page=page,
             per_page=per_page,
         )
+        _table_total_cache.set(
+            _table_total_key(
+                user_id, search, tag, status, archive_filter, date_from, date_to
+            ),
+            total,
+        )
 
         start = (page - 1) * per_page + 1
         end = min(start + per_page - 1, total)
 
-        return templates.TemplateResponse(
+        return render(
             "components/notes_table_body.html",
             {
                 "request": request,
@@ -277,14 +394,14 @@ async def get_notes_table_data(
         )
     except Exception as e:
         logger.exception(f"Error loading notes table data: {e}")
-        return HTMLResponse(content="", status_code=500)
+        return Response(status_code=500)
 
 
 @router.get("/web/notes/table/components/pagination", response_class=HTMLResponse)
-async def get_notes_table_pagination(
+def get_notes_table_pagination(
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
     page: int = 1,
     per_page: int = 20,
     search: str = "",
@@ -297,12 +414,6 @@ async def get_notes_table_pagination(
     sort_order: str = "desc",
 ):
     """Render pagination component for notes table."""
-    user = await get_current_user_from_cookie(
-        request, session=session, access_token=access_token
-    )
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
@@ -311,25 +422,26 @@ async def get_notes_table_pagination(
     )
 
     try:
-        _, computed_total = note_service.list_notes_advanced(
-            user_id=user_id,
-            search=search if search else None,
-            tag=tag if tag and tag != "all" else None,
-            status=status if status and status != "all" else None,
-            include_archived=include_archived,
-            archived_only=archived_only,
-            date_from=parsed_date_from,
-            date_to=parsed_date_to,
-            sort_by=sort_by,
-            sort_order=sort_order,
-            page=page,
-            per_page=per_page,
+        key = _table_total_key(
+            user_id, search, tag, status, archive_filter, date_from, date_to
         )
+        computed_total = _table_total_cache.get(key)
+        if computed_total is None:
+            computed_total = note_service.count_notes_advanced(
+                user_id=user_id,
+                search=search if search else None,
+                tag=tag if tag and tag != "all" else None,
+                status=status if status and status != "all" else None,
+                include_archived=include_archived,
+                archived_only=archived_only,
+                date_from=parsed_date_from,
+                date_to=parsed_date_to,
+            )
 
         start = (page - 1) * per_page + 1
         end = min(start + per_page - 1, computed_total)
 
-        return templates.TemplateResponse(
+        return render(
             "components/pagination.html",
             {
                 "request": request,
@@ -350,14 +462,13 @@ async def get_notes_table_pagination(
         )
     except Exception as e:
         logger.exception(f"Error loading pagination: {e}")
-        return HTMLResponse(content="", status_code=500)
+        return Response(status_code=500)
 
 
 @router.post("/web/notes/table/bulk", response_class=HTMLResponse)
 async def bulk_notes_action(
-    request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
     note_ids: Annotated[str | None, Form()] = None,
     action: Annotated[str | None, Form()] = None,
 ):
@@ -366,85 +477,69 @@ async def bulk_notes_action(
 
     Returns updated table body.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     if not note_ids or not action:
-        return HTMLResponse(content="", status_code=400)
+        return Response(status_code=400)
 
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
-    try:
-        parsed_ids = [
-            int(id_str.strip())
-            for id_str in note_ids.split(",")
-            if id_str.strip() and id_str.strip().isdigit()
-        ]
-        if not parsed_ids:
-            return HTMLResponse(content="", status_code=400)
-    except (ValueError, AttributeError):
-        return HTMLResponse(content="", status_code=400)
+    parsed_ids = list(map(int, _NOTE_ID_RE.findall(note_ids)))
+    if not parsed_ids or len(parsed_ids) > _MAX_BULK_IDS:
+        return Response(status_code=400)
 
     try:
         if action == "archive":
             note_service.bulk_archive_notes(parsed_ids, user_id)
-            for note_id in parsed_ids:
-                await event_manager.broadcast(user_id, "note-archived", str(note_id))
+            await event_manager.broadcast_many(
+                user_id, "note-archived", [str(note_id) for note_id in parsed_ids]
+            )
         elif action == "unarchive":
             note_service.bulk_unarchive_notes(parsed_ids, user_id)
-            for note_id in parsed_ids:
-                await event_manager.broadcast(user_id, "note-unarchived", str(note_id))
+            await event_manager.broadcast_many(
+                user_id, "note-unarchived", [str(note_id) for note_id in parsed_ids]
+            )
         elif action == "delete":
             deleted_ids = note_service.bulk_delete_notes(parsed_ids, user_id)
-            for note_id in deleted_ids:
-                await event_manager.broadcast(user_id, "note-deleted", str(note_id))
+            await event_manager.broadcast_many(
+                user_id, "note-deleted", [str(note_id) for note_id in deleted_ids]
+            )
 
-        return HTMLResponse(content="", status_code=200)
+        return Response(status_code=200)
     except Exception as e:
         logger.exception(f"Error in bulk action: {e}")
         return HTMLResponse(content="Error performing bulk action", status_code=500)
 
 
 @router.patch("/web/notes/{note_id}/archive", response_class=HTMLResponse)
-async def archive_note_web(
+def archive_note_web(
     note_id: int,
-    request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
 ):
     """Archive a note (HTMX)."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
     user_id = require_user_id(user)
 
     note_service = NoteService(session)
     try:
         note_service.archive_note(note_id, user_id)
-        return HTMLResponse(content="", status_code=200)
+        return Response(status_code=200)
     except NotFoundError:
         return HTMLResponse(content="Note not found", status_code=404)
 
 
 @router.patch("/web/notes/{note_id}/unarchive", response_class=HTMLResponse)
-async def unarchive_note_web(
+def unarchive_note_web(
     note_id: int,
-    request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
 ):
     """Unarchive a note (HTMX)."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
     user_id = require_user_id(user)
 
     note_service = NoteService(session)
     try:
         note_service.unarchive_note(note_id, user_id)
-        return HTMLResponse(content="", status_code=200)
+        return Response(status_code=200)
     except NotFoundError:
         return HTMLResponse(content="Note not found", status_code=404)
 
@@ -452,21 +547,17 @@ async def unarchive_note_web(
 @router.delete("/web/notes/{note_id}", response_class=HTMLResponse)
 async def delete_note_web(
     note_id: int,
-    request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
 ):
     """Delete a note (HTMX)."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
     user_id = require_user_id(user)
 
     note_service = NoteService(session)
     try:
         note_service.delete_note(note_id, user_id)
         await event_manager.broadcast(user_id, "note-deleted", str(note_id))
-        return HTMLResponse(content="", status_code=200)
+        return Response(status_code=200)
     except NotFoundError:
         return HTMLResponse(content="Note not found", status_code=404)
 
@@ -475,15 +566,11 @@ async def delete_note_web(
 async def create_text_note_web(
     request: Request,
     session: SessionDep,
+    user: WebUserDep,
     background_tasks: BackgroundTasks,
     text: Annotated[str, Form()] = "",
-    access_token: str | None = Cookie(default=None),
 ):
     """Create a new text note (HTMX)."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
@@ -500,7 +587,7 @@ async def create_text_note_web(
 
         await event_manager.broadcast(user_id, "note-created", str(note.id))
 
-        return templates.TemplateResponse(
+        return render(
             "components/note_card.html",
             {
                 "request": request,
@@ -511,43 +598,43 @@ async def create_text_note_web(
         )
     except Exception as e:
         logger.exception(f"Error creating text note: {e}")
-        return HTMLResponse(content="", status_code=500)
+        return Response(status_code=500)
 
 
 @router.get("/web/notes/recent", response_class=HTMLResponse)
-async def get_recent_notes_web(
+def get_recent_notes_web(
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
-) -> HTMLResponse:
+    user: WebUserDep,
+) -> Response:
     """
     Get recent notes for the home page (HTMX).
 
     Returns HTML for note cards, excluding archived notes.
     Used for initial page load and real-time updates via SSE.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
     try:
-        notes, total = note_service.list_notes(user_id, skip=0, limit=100)
-
-        return templates.TemplateResponse(
-            "components/note_card.html",
-            {
-                "request": request,
-                "notes": notes,
-                "total": total,
-                "show_count": True,
-            },
+        notes, total = note_service.list_recent_notes(user_id, limit=100)
+
+        return StreamingResponse(
+            _stream_template(
+                "components/note_card.html",
+                {
+                    "request": request,
+                    "notes": notes,
+                    "total": total,
+                    "show_count": True,
+                },
+                _RECENT_NOTES_ERROR_HTML,
+            ),
+            media_type="text/html",
         )
     except Exception as e:
         logger.exception(f"Error loading recent notes: {e}")
-        return templates.TemplateResponse(
+        return render(
             "components/note_card.html",
             {
                 "request": request,
@@ -559,28 +646,29 @@ async def get_recent_notes_web(
 
 
 @router.get("/web/notes/{note_id}/card", response_class=HTMLResponse)
-async def get_note_card_web(
+def get_note_card_web(
     note_id: int,
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
-) -> HTMLResponse:
+    user: WebUserDep,
+) -> Response:
     """
     Get note card HTML for SSE updates (HTMX).
 
     Returns HTML for a single note card, used for live updates.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
     try:
         note = note_service.get_note(note_id, user_id)
-        return templates.TemplateResponse(
+        etag = _note_etag(note)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=_note_cache_headers(etag))
+
+        return _render_note_fragment(
             "components/note_card.html",
+            etag,
             {
                 "request": request,
                 "notes": [note],
@@ -589,75 +677,71 @@ async def get_note_card_web(
             },
         )
     except NotFoundError:
-        return HTMLResponse(content="", status_code=404)
+        return Response(status_code=404)
     except Exception as e:
         logger.exception(f"Error loading note card: {e}")
-        return HTMLResponse(content="", status_code=500)
+        return Response(status_code=500)
 
 
 @router.get("/web/notes/{note_id}/modal", response_class=HTMLResponse)
-async def get_note_modal_web(
+def get_note_modal_web(
     note_id: int,
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
-) -> HTMLResponse:
+    user: WebUserDep,
+    user_settings: WebUserSettingsDep,
+) -> Response:
     """
     Get note modal HTML (HTMX).
 
     Returns HTML for note modal, used for inline editing.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
     try:
         note = note_service.get_note(note_id, user_id)
-        user_settings = get_user_settings(session, user)
-        available_tags = get_custom_tags(user_settings.custom_tags)
+        available_tags = user_settings.custom_tags_list
 
-        return templates.TemplateResponse(
+        return render(
             "components/note_modal.html",
             {
                 "request": request,
                 "note": note,
                 "available_tags": available_tags,
-                "now": datetime.now(UTC),
             },
         )
     except NotFoundError:
-        return HTMLResponse(content="", status_code=404)
+        return Response(status_code=404)
     except Exception as e:
         logger.exception(f"Error loading note modal: {e}")
-        return HTMLResponse(content="", status_code=500)
+        return Response(status_code=500)
 
 
 @router.get("/web/notes/{note_id}/status", response_class=HTMLResponse)
-async def get_note_status_web(
+def get_note_status_web(
     note_id: int,
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
-) -> HTMLResponse:
+    user: WebUserDep,
+) -> Response:
     """
     Get note status badge HTML for SSE updates (HTMX).
 
     Returns HTML for the status badge, used for live updates.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     user_id = require_user_id(user)
     note_service = NoteService(session)
 
     try:
         note = note_service.get_note(note_id, user_id)
-        return templates.TemplateResponse(
+        etag = _note_etag(note)
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=_note_cache_headers(etag))
+
+        return _render_note_fragment(
             "components/status_badge.html",
+            etag,
             {
                 "request": request,
                 "note": note,
@@ -665,8 +749,8 @@ async def get_note_status_web(
             },
         )
     except NotFoundError:
-        return HTMLResponse(content="", status_code=404)
+        return Response(status_code=404)
     except Exception as e:
         logger.exception(f"Error loading note status: {e}")
-        return HTMLResponse(content="", status_code=500)
+        return Response(status_code=500)
 
@@ -1,52 +1,51 @@
 """Page routes."""
 
-from fastapi import Cookie, Request
+from fastapi import Request
 from fastapi.responses import HTMLResponse, RedirectResponse
+from sqlmodel import select
 
-from app.api.deps import SessionDep, get_user_settings
-from app.utils import get_custom_tags
+from app.api.deps import SessionDep
+from app.models.user import User
 
-from . import get_current_user_from_cookie, router, templates
+from . import CookieUserDep, CookieUserSettingsDep, render, router
 
 
 @router.get("/", response_class=HTMLResponse)
 async def home(
     request: Request,
-    session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: CookieUserDep,
 ):
     """Render home page."""
-    user = await get_current_user_from_cookie(request, session, access_token)
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
-    return templates.TemplateResponse(
-        "home.html", {"request": request, "current_user": user}
-    )
+    return render("home.html", {"request": request, "current_user": user})
 
 
 @router.get("/settings", response_class=HTMLResponse)
-async def settings_page(
+def settings_page(
     request: Request,
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: CookieUserDep,
+    user_settings: CookieUserSettingsDep,
 ):
     """Render settings page."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
+    if not user or not user_settings:
         return RedirectResponse(url="/login", status_code=303)
 
-    user_settings = get_user_settings(session, user)
-    custom_tags = get_custom_tags(user_settings.custom_tags)
+    # The cached user may predate a token change made through another worker
+    api_token = session.exec(select(User.api_token).where(User.id == user.id)).one()
+
+    custom_tags = user_settings.custom_tags_list
 
     server_url = str(request.base_url).rstrip("/")
 
-    return templates.TemplateResponse(
+    return render(
         "settings.html",
         {
             "request": request,
             "current_user": user,
-            "api_token": user.api_token,
+            "api_token": api_token,
             "server_url": server_url,
             "settings": {
                 "ollama_url": user_settings.ollama_url,
@@ -1,110 +1,161 @@
 """Settings web routes for HTMX frontend."""
 
+import re
 import secrets
+import string
 from typing import Annotated
 
-from fastapi import Cookie, Form, Request
-from fastapi.responses import HTMLResponse
+import orjson
+from fastapi import Form
+from fastapi.responses import HTMLResponse, Response
+from sqlalchemy import update
 
-from app.api.deps import SessionDep, _update_user_settings, get_user_settings
+from app.api.deps import SessionDep, invalidate_cached_user
+from app.models.user import User, UserSettings
 from app.services.ollama_service import OllamaService
 
-from . import get_current_user_from_cookie, logger, router, templates
+from . import (
+    CookieUserDep,
+    CookieUserSettingsDep,
+    WebUserDep,
+    WebUserSettingsDep,
+    logger,
+    router,
+    templates,
+)
+
+# Static fragments are encoded once at import instead of on every response
+_CONNECTED_HTML = b"""
+    <div class="flex items-center gap-3">
+        <div class="p-2 rounded-full bg-green-100 dark:bg-green-900/30">
+            <svg class="w-5 h-5 text-green-600 dark:text-green-400" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7" />
+            </svg>
+        </div>
+        <div>
+            <p class="font-medium text-green-600 dark:text-green-400">Connected to Ollama</p>
+            <p class="text-sm text-neutral-600 dark:text-neutral-400">Your AI backend is ready</p>
+        </div>
+    </div>
+    """
+
+_DISCONNECTED_HTML = b"""
+    <div class="flex items-center gap-3">
+        <div class="p-2 rounded-full bg-red-100 dark:bg-red-900/30">
+            <svg class="w-5 h-5 text-red-600 dark:text-red-400" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+                <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12" />
+            </svg>
+        </div>
+        <div>
+            <p class="font-medium text-red-600 dark:text-red-400">Cannot connect to Ollama</p>
+            <p class="text-sm text-neutral-600 dark:text-neutral-400">Make sure Ollama is running at the configured URL</p>
+        </div>
+    </div>
+    """
+
+_GENERATE_TOKEN_BUTTON_HTML = b"""
+    <button hx-post="/web/api-token" hx-target="#api-token-section" hx-swap="innerHTML"
+        class="w-full py-3 rounded-lg font-medium text-white transition flex items-center justify-center gap-2"
+        style="background: linear-gradient(135deg, #FF6B6B, #FF8E53);">
+        <svg class="w-5 h-5" fill="none" viewBox="0 0 24 24" stroke="currentColor">
+            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2"
+                d="M15 7a2 2 0 012 2m4 0a6 6 0 01-7.743 5.743L11 17H9v2H7v2H4a1 1 0 01-1-1v-2.586a1 1 0 01.293-.707l5.964-5.964A6 6 0 1121 9z" />
+        </svg>
+        Generate API Token
+    </button>
+    """
+
+# Tokens from secrets.token_urlsafe are URL-safe, so need no HTML escaping
+_API_TOKEN_HTML = string.Template(
+    """
+    <div class="p-4 rounded-lg bg-neutral-100 dark:bg-neutral-800">
+        <div class="flex items-center justify-between mb-2">
+            <span class="text-sm font-medium text-neutral-950 dark:text-neutral-50">Your API Token</span>
+            <button hx-delete="/web/api-token" hx-target="#api-token-section" hx-swap="innerHTML"
+                hx-confirm="Revoke this token? Any Siri shortcuts using it will stop working."
+                class="inline-flex items-center justify-center px-3 py-1 text-xs font-medium text-red-600 transition-colors duration-200 rounded-md bg-red-100 hover:bg-red-200 focus:outline-none focus:ring-2 focus:ring-red-500 focus:ring-offset-2 dark:bg-red-900/30 dark:text-red-400 dark:hover:bg-red-900/50 dark:focus:ring-red-400 dark:focus:ring-offset-neutral-900">
+                Revoke
+            </button>
+        </div>
+        <code class="block p-3 text-sm break-all rounded bg-white dark:bg-neutral-900 text-neutral-950 dark:text-neutral-50 border border-neutral-200 dark:border-neutral-700">$api_token</code>
+    </div>
+    """
+)
+
+# Compiled once; autoescaping keeps odd model names from breaking the markup
+_MODEL_OPTIONS_TEMPLATE = templates.env.from_string(
+    "{% for model in models %}"
+    '<option value="{{ model }}"{% if model == current %} selected{% endif %}>'
+    "{{ model }}</option>\n"
+    "{% endfor %}"
+)
+
+
+# Comma separator with its surrounding whitespace, so tags need no strip()
+_TAG_SPLIT_RE = re.compile(r"\s*,\s*")
+
+
+def _blank_to_none(value: str | None) -> str | None:
+    """Strip a form value, treating blank input as not provided."""
+    if value is None:
+        return None
+    return value.strip() or None
 
 
 @router.get("/web/settings/models", response_class=HTMLResponse)
 async def get_models(
-    request: Request,
-    session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: CookieUserDep,
+    user_settings: CookieUserSettingsDep,
     ollama_url: str | None = None,
 ):
     """Get available Ollama models as select options."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
+    if not user or not user_settings:
         return HTMLResponse(content="<option>Please log in</option>")
 
-    user_settings = get_user_settings(session, user)
+    current_model = user_settings.ollama_model
     target_url = ollama_url or user_settings.ollama_url
 
     ollama = OllamaService(base_url=target_url, api_key=user_settings.ollama_api_key)
 
     try:
-        models = await ollama.get_available_models()
+        models = await ollama.get_available_models_cached()
         if not models:
-            models = [user_settings.ollama_model]
+            models = [current_model]
     except Exception as e:
         logger.warning(f"Failed to fetch models from Ollama: {e}")
-        models = [user_settings.ollama_model]
-
-    options = []
-    if user_settings.ollama_model not in models:
-        models.insert(0, user_settings.ollama_model)
+        models = [current_model]
 
-    for model in models:
-        selected = "selected" if model == user_settings.ollama_model else ""
-        options.append(f'<option value="{model}" {selected}>{model}</option>')
+    if current_model not in models:
+        models.insert(0, current_model)
 
-    return HTMLResponse(content="\n".join(options))
+    return HTMLResponse(
+        content=_MODEL_OPTIONS_TEMPLATE.render(models=models, current=current_model)
+    )
 
 
 @router.get("/web/settings/status", response_class=HTMLResponse)
 async def get_connection_status(
-    request: Request,
-    session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: CookieUserDep,
+    user_settings: CookieUserSettingsDep,
     ollama_url: str | None = None,
 ):
     """Get Ollama connection status."""
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
+    if not user or not user_settings:
         return HTMLResponse(content="<p>Please log in</p>")
 
-    user_settings = get_user_settings(session, user)
     target_url = ollama_url or user_settings.ollama_url
 
     ollama = OllamaService(base_url=target_url, api_key=user_settings.ollama_api_key)
     connected = await ollama.check_connection()
 
-    if connected:
-        return HTMLResponse(
-            content="""
-            <div class="flex items-center gap-3">
-                <div class="p-2 rounded-full bg-green-100 dark:bg-green-900/30">
-                    <svg class="w-5 h-5 text-green-600 dark:text-green-400" fill="none" viewBox="0 0 24 24" stroke="currentColor">
-                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 13l4 4L19 7" />
-                    </svg>
-                </div>
-                <div>
-                    <p class="font-medium text-green-600 dark:text-green-400">Connected to Ollama</p>
-                    <p class="text-sm text-neutral-600 dark:text-neutral-400">Your AI backend is ready</p>
-                </div>
-            </div>
-            """
-        )
-    else:
-        return HTMLResponse(
-            content="""
-            <div class="flex items-center gap-3">
-                <div class="p-2 rounded-full bg-red-100 dark:bg-red-900/30">
-                    <svg class="w-5 h-5 text-red-600 dark:text-red-400" fill="none" viewBox="0 0 24 24" stroke="currentColor">
-                        <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M6 18L18 6M6 6l12 12" />
-                    </svg>
-                </div>
-                <div>
-                    <p class="font-medium text-red-600 dark:text-red-400">Cannot connect to Ollama</p>
-                    <p class="text-sm text-neutral-600 dark:text-neutral-400">Make sure Ollama is running at the configured URL</p>
-                </div>
-            </div>
-            """
-        )
+    return HTMLResponse(content=_CONNECTED_HTML if connected else _DISCONNECTED_HTML)
 
 
 @router.patch("/web/settings", response_class=HTMLResponse)
-async def update_settings_web(
-    request: Request,
+def update_settings_web(
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
+    user_settings: WebUserSettingsDep,
     ollama_url: Annotated[str | None, Form()] = None,
     ollama_model: Annotated[str | None, Form()] = None,
     ollama_embedding_model: Annotated[str | None, Form()] = None,
@@ -113,114 +164,86 @@ async def update_settings_web(
     homeassistant_url: Annotated[str | None, Form()] = None,
     homeassistant_token: Annotated[str | None, Form()] = None,
     homeassistant_device: Annotated[str | None, Form()] = None,
-) -> HTMLResponse:
+) -> Response:
     """
     Update user settings (HTMX Form).
 
     Accepts form data, processes tags, and updates the database.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
-    user_settings = get_user_settings(session, user)
+    form_values = {
+        "ollama_url": ollama_url,
+        "ollama_model": ollama_model,
+        "ollama_embedding_model": ollama_embedding_model,
+        "ollama_api_key": ollama_api_key,
+        "homeassistant_url": homeassistant_url,
+        "homeassistant_token": homeassistant_token,
+        "homeassistant_device": homeassistant_device,
+    }
+    # Only keep values that differ from the row read in this request (never
+    # from a cached copy), so unchanged auto-saves skip the write
+    changes: dict[str, str] = {}
+    for field, value in form_values.items():
+        cleaned = _blank_to_none(value)
+        if cleaned is not None and cleaned != getattr(user_settings, field):
+            changes[field] = cleaned
 
-    custom_tags_list: list[str] | None = None
     if custom_tags is not None:
-        custom_tags_list = [
-            tag.strip() for tag in custom_tags.split(",") if tag.strip()
-        ]
-
-    _update_user_settings(
-        user_settings,
-        ollama_url=ollama_url if ollama_url else None,
-        ollama_model=ollama_model if ollama_model else None,
-        ollama_embedding_model=(
-            ollama_embedding_model if ollama_embedding_model else None
-        ),
-        ollama_api_key=ollama_api_key.strip() if ollama_api_key else None,
-        custom_tags=custom_tags_list,
-        homeassistant_url=homeassistant_url.strip() if homeassistant_url else None,
-        homeassistant_token=(
-            homeassistant_token.strip() if homeassistant_token else None
-        ),
-        homeassistant_device=(
-            homeassistant_device.strip() if homeassistant_device else None
-        ),
-    )
-
-    session.add(user_settings)
-    session.commit()
+        tags_list = [tag for tag in _TAG_SPLIT_RE.split(custom_tags.strip()) if tag]
+        if tags_list != user_settings.custom_tags_list:
+            changes["custom_tags"] = orjson.dumps(tags_list).decode()
+
+    if changes:
+        session.execute(
+            update(UserSettings)
+            .where(UserSettings.user_id == user.id)  # type: ignore[arg-type]
+            .values(**changes)
+        )
+        session.commit()
+        invalidate_cached_user(user.id)
 
-    return HTMLResponse(content="", status_code=200)
+    return Response(status_code=200)
 
 
 @router.post("/web/api-token", response_class=HTMLResponse)
-async def generate_api_token_web(
-    request: Request,
+def generate_api_token_web(
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
 ) -> HTMLResponse:
     """
     Generate a new API token (HTMX).
 
     Returns HTML for the updated API token section.
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
     api_token = secrets.token_urlsafe(32)
 
-    user.api_token = api_token
-    session.add(user)
+    session.execute(
+        update(User)
+        .where(User.id == user.id)  # type: ignore[arg-type]
+        .values(api_token=api_token)
+    )
     session.commit()
+    invalidate_cached_user(user.id)
 
-    html_content = f"""
-    <div class="p-4 rounded-lg bg-neutral-100 dark:bg-neutral-800">
-        <div class="flex items-center justify-between mb-2">
-            <span class="text-sm font-medium text-neutral-950 dark:text-neutral-50">Your API Token</span>
-            <button hx-delete="/web/api-token" hx-target="#api-token-section" hx-swap="innerHTML"
-                hx-confirm="Revoke this token? Any Siri shortcuts using it will stop working."
-                class="inline-flex items-center justify-center px-3 py-1 text-xs font-medium text-red-600 transition-colors duration-200 rounded-md bg-red-100 hover:bg-red-200 focus:outline-none focus:ring-2 focus:ring-red-500 focus:ring-offset-2 dark:bg-red-900/30 dark:text-red-400 dark:hover:bg-red-900/50 dark:focus:ring-red-400 dark:focus:ring-offset-neutral-900">
-                Revoke
-            </button>
-        </div>
-        <code class="block p-3 text-sm break-all rounded bg-white dark:bg-neutral-900 text-neutral-950 dark:text-neutral-50 border border-neutral-200 dark:border-neutral-700">{api_token}</code>
-    </div>
-    """
-    return HTMLResponse(content=html_content)
+    return HTMLResponse(content=_API_TOKEN_HTML.substitute(api_token=api_token))
 
 
 @router.delete("/web/api-token", response_class=HTMLResponse)
-async def revoke_api_token_web(
-    request: Request,
+def revoke_api_token_web(
     session: SessionDep,
-    access_token: str | None = Cookie(default=None),
+    user: WebUserDep,
 ) -> HTMLResponse:
     """
     Revoke the current API token (HTMX).
 
     Returns HTML for the updated API token section (generate button).
     """
-    user = await get_current_user_from_cookie(request, session, access_token)
-    if not user:
-        return HTMLResponse(content="", status_code=401)
-
-    user.api_token = None
-    session.add(user)
+    session.execute(
+        update(User)
+        .where(User.id == user.id)  # type: ignore[arg-type]
+        .values(api_token=None)
+    )
     session.commit()
+    invalidate_cached_user(user.id)
 
-    html_content = """
-    <button hx-post="/web/api-token" hx-target="#api-token-section" hx-swap="innerHTML"
-        class="w-full py-3 rounded-lg font-medium text-white transition flex items-center justify-center gap-2"
-        style="background: linear-gradient(135deg, #FF6B6B, #FF8E53);">
-        <svg class="w-5 h-5" fill="none" viewBox="0 0 24 24" stroke="currentColor">
-            <path stroke-linecap="round" stroke-linejoin="round" stroke-width="2"
-                d="M15 7a2 2 0 012 2m4 0a6 6 0 01-7.743 5.743L11 17H9v2H7v2H4a1 1 0 01-1-1v-2.586a1 1 0 01.293-.707l5.964-5.964A6 6 0 1121 9z" />
-        </svg>
-        Generate API Token
-    </button>
-    """
-    return HTMLResponse(content=html_content)
+    return HTMLResponse(content=_GENERATE_TOKEN_BUTTON_HTML)
 
@@ -24,11 +24,17 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./scribe.db"
+    db_pool_size: int = 25
+    db_max_overflow: int = 25
+    db_pool_recycle: int = 1800  # seconds
+    db_pool_timeout: int = 5  # seconds to wait for a free connection
 
     # Ollama defaults (per-user overrides in UserSettings)
     default_ollama_url: str = "http://localhost:11434"
     default_ollama_model: str = "qwen3:4b-instruct"
     embedding_model: str = "nomic-embed-text"
+    # Cosine similarity at which a search reuses results of an earlier query
+    semantic_cache_threshold: float = 0.95
 
     # Whisper
     whisper_model: str = "small"
@@ -7,24 +7,27 @@ from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 
 from app.api.routes.auth import router as auth_router
 from app.api.routes.events import router as events_router
 from app.api.routes.notes import router as notes_router
 from app.api.routes.search import router as search_router
 from app.api.routes.settings import router as settings_router
+from app.api.routes.web import precompile_templates
 from app.api.routes.web import router as web_router
 from app.config import settings
-from app.database import create_db_and_tables
+from app.database import QueryCountMiddleware, create_db_and_tables
 from app import scheduler
-from app.services.ollama_service import OllamaService
+from app.services.ollama_service import OllamaService, close_http_client
+from app.utils.static import STATIC_DIR, CachedStaticFiles
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
     create_db_and_tables()
     Path("uploads").mkdir(exist_ok=True)
+    precompile_templates()
 
     jobstore = SQLAlchemyJobStore(url=settings.database_url)
     scheduler_instance = AsyncIOScheduler(jobstores={"default": jobstore})
@@ -36,6 +39,7 @@ async def lifespan(_app: FastAPI):
     yield
     scheduler_instance.shutdown()
     scheduler.scheduler = None
+    await close_http_client()
 
 
 app = FastAPI(
@@ -43,6 +47,7 @@ app = FastAPI(
     description="A self-hosted voice note application with AI transcription and semantic search",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -53,7 +58,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+if settings.debug:
+    app.add_middleware(QueryCountMiddleware)
+
+app.mount("/static", CachedStaticFiles(directory=STATIC_DIR), name="static")
 
 # Include API routers
 app.include_router(auth_router)
@@ -75,7 +83,7 @@ async def health_check() -> dict:
     """
     # Check Ollama connection
     ollama = OllamaService()
-    ollama_connected = await ollama.check_connection()
+    ollama_connected = await ollama.check_connection_cached()
 
     # Database is connected if we reached this point
     db_connected = True
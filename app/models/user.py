@@ -5,6 +5,8 @@ from typing import TYPE_CHECKING
 
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.utils import get_custom_tags
+
 if TYPE_CHECKING:
     from app.models.note import Note
 
@@ -56,3 +58,8 @@ class UserSettings(SQLModel, table=True):
 
     # Relationships
     user: User = Relationship(back_populates="settings")
+
+    @property
+    def custom_tags_list(self) -> list[str]:
+        """Custom tags parsed from their JSON column."""
+        return get_custom_tags(self.custom_tags)
@@ -33,6 +33,7 @@ class TokenData(BaseModel):
     """Token payload data."""
 
     user_id: int | None = None
+    expires_at: datetime | None = None
 
 
 class ApiTokenResponse(BaseModel):
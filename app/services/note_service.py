@@ -1,18 +1,42 @@
 """Note service for CRUD operations and search."""
 
+import asyncio
 import logging
+from collections.abc import AsyncIterator
 from datetime import UTC, datetime
+from pathlib import Path
 
-from sqlalchemy import or_, text
+import numpy as np
+from sqlalchemy import delete, or_, text, update
+from sqlalchemy.orm import load_only, raiseload
 from sqlmodel import Session, func, select
 
+from app.config import settings
 from app.models.note import Note
 from app.models.user import UserSettings
 from app.services.ollama_service import OllamaService
+from app.utils.cache import SimilarityCache, TTLCache
 from app.utils.exceptions import NotFoundError
 
 logger = logging.getLogger(__name__)
 
+# Notes are rendered in loops, so a lazy-loaded relationship would cost one
+# query per note. In debug, make such loads fail loudly instead.
+_NOTE_LOAD_OPTIONS = (raiseload("*"),) if settings.debug else ()
+
+# Search query embeddings keyed by (Ollama URL, embedding model, normalized
+# query); repeated and refined searches skip the round trip to Ollama
+_query_embedding_cache: TTLCache[tuple[str, str, str], bytes] = TTLCache(
+    maxsize=1024, ttl=3600
+)
+
+# Ranked note IDs of recent semantic searches per (user, embedding model,
+# limit), reused for near-duplicate queries. Hits re-select the rows, so
+# edited, archived and deleted notes are never served from the cache.
+_search_result_cache: SimilarityCache[tuple[int, str, int], list[int]] = (
+    SimilarityCache(maxsize=64, ttl=60, threshold=settings.semantic_cache_threshold)
+)
+
 
 class NoteService:
     """Service for note CRUD operations and search."""
@@ -65,7 +89,7 @@ class NoteService:
         Raises:
             NotFoundError: If note not found or doesn't belong to user
         """
-        note = self.session.get(Note, note_id)
+        note = self.session.get(Note, note_id, options=_NOTE_LOAD_OPTIONS)
         if not note or note.user_id != user_id:
             raise NotFoundError("Note")
         return note
@@ -94,6 +118,7 @@ class NoteService:
         # Get paginated notes (exclude archived)
         statement = (
             select(Note)
+            .options(*_NOTE_LOAD_OPTIONS)
             .where(Note.user_id == user_id, Note.archived == False)  # noqa: E712
             .order_by(Note.created_at.desc())  # type: ignore
             .offset(skip)
@@ -102,6 +127,49 @@ class NoteService:
         notes = list(self.session.exec(statement).all())
         return notes, total
 
+    def list_recent_notes(
+        self, user_id: int, limit: int = 100
+    ) -> tuple[list[Note], int]:
+        """
+        List unarchived notes newest first for the note card feed.
+
+        Only the columns note cards render are loaded, so the embedding BLOB
+        and audio path stay in the database.
+
+        Args:
+            user_id: Owner user ID
+            limit: Maximum records to return
+
+        Returns:
+            Tuple of (notes list, total unarchived count)
+        """
+        conditions = [
+            Note.user_id == user_id,
+            Note.archived == False,  # noqa: E712
+        ]
+        total = self.session.exec(select(func.count()).where(*conditions)).one()
+
+        statement = (
+            select(Note)
+            .options(
+                load_only(
+                    Note.raw_transcript,  # type: ignore[arg-type]
+                    Note.summary,  # type: ignore[arg-type]
+                    Note.tag,  # type: ignore[arg-type]
+                    Note.notification_timestamp,  # type: ignore[arg-type]
+                    Note.processing_status,  # type: ignore[arg-type]
+                    Note.error_message,  # type: ignore[arg-type]
+                    Note.created_at,  # type: ignore[arg-type]
+                ),
+                *_NOTE_LOAD_OPTIONS,
+            )
+            .where(*conditions)
+            .order_by(Note.created_at.desc())  # type: ignore
+            .limit(limit)
+        )
+        notes = list(self.session.exec(statement).all())
+        return notes, total
+
     def update_note(
         self,
         note_id: int,
@@ -126,23 +194,27 @@ class NoteService:
         Raises:
             NotFoundError: If note not found or doesn't belong to user
         """
-        note = self.get_note(note_id, user_id)
+        values: dict = {"updated_at": datetime.now(UTC)}
 
         if raw_transcript is not None:
-            note.raw_transcript = raw_transcript
+            values["raw_transcript"] = raw_transcript
 
         if summary is not None:
-            note.summary = summary
+            values["summary"] = summary
 
         if tag is not None:
-            note.tag = tag
+            values["tag"] = tag
 
-        note.updated_at = datetime.now(UTC)
+        return self._update_returning(note_id, user_id, values)
 
-        self.session.add(note)
-        self.session.commit()
-        self.session.refresh(note)
-        return note
+    def _delete_audio_file(self, audio_path: Path) -> None:
+        """Remove a note's audio file, logging rather than raising on failure."""
+        try:
+            if audio_path.exists():
+                audio_path.unlink()
+                logger.info(f"Deleted audio file: {audio_path}")
+        except Exception as e:
+            logger.error(f"Error deleting audio file {audio_path}: {e}")
 
     def delete_note(self, note_id: int, user_id: int) -> bool:
         """
@@ -162,20 +234,33 @@ class NoteService:
 
         # Delete audio file if it exists
         if note.audio_path:
-            from pathlib import Path
-
-            audio_path = Path(note.audio_path)
-            try:
-                if audio_path.exists():
-                    audio_path.unlink()
-                    logger.info(f"Deleted audio file: {audio_path}")
-            except Exception as e:
-                logger.error(f"Error deleting audio file {audio_path}: {e}")
+            self._delete_audio_file(Path(note.audio_path))
 
         self.session.delete(note)
         self.session.commit()
         return True
 
+    async def embed_query(self, ollama: OllamaService, query: str) -> bytes:
+        """
+        Get the embedding for a search query, reusing recent results.
+
+        Args:
+            ollama: Ollama service configured with the user's settings
+            query: Search query text
+
+        Returns:
+            Serialized query embedding
+        """
+        key = (ollama.base_url, ollama.embedding_model, " ".join(query.lower().split()))
+        query_embedding = _query_embedding_cache.get(key)
+        if query_embedding is None:
+            query_embedding = await ollama.generate_embedding(query)
+            _query_embedding_cache.set(key, query_embedding)
+            logger.info(
+                f"Generated search embedding for query '{query}': {len(query_embedding)} bytes"
+            )
+        return query_embedding
+
     async def search_notes_semantic(
         self, user_id: int, query: str, user_settings: UserSettings, limit: int = 10
     ) -> list[Note]:
@@ -199,11 +284,14 @@ class NoteService:
             api_key=user_settings.ollama_api_key,
         )
 
-        # Generate embedding for query
-        query_embedding = await ollama.generate_embedding(query)
-        logger.info(
-            f"Generated search embedding for query '{query}': {len(query_embedding)} bytes"
-        )
+        query_embedding = await self.embed_query(ollama, query)
+
+        cache_scope = (user_id, ollama.embedding_model, limit)
+        query_vector = np.frombuffer(query_embedding, dtype=np.float32)
+        cached_ids = _search_result_cache.get(cache_scope, query_vector)
+        if cached_ids is not None:
+            logger.info(f"Semantic search cache hit for query '{query}'")
+            return await asyncio.to_thread(self._get_ranked_notes, user_id, cached_ids)
 
         # Use raw SQL for vector search with sqlite-vec
         sql = text(
@@ -222,17 +310,17 @@ class NoteService:
         )
 
         try:
-            # Execute and get rows as mappings
-            result = self.session.execute(
-                sql,
-                {
-                    "query_vec": query_embedding,
-                    "user_id": user_id,
-                    "limit": limit,
-                    "vec_len": len(query_embedding),
-                },
+            # The vector scan is the slow part of a search; run it in a
+            # worker thread so it doesn't block the event loop
+            params = {
+                "query_vec": query_embedding,
+                "user_id": user_id,
+                "limit": limit,
+                "vec_len": len(query_embedding),
+            }
+            rows = await asyncio.to_thread(
+                lambda: self.session.execute(sql, params).all()
             )
-            rows = result.all()
         except Exception as e:
             logger.error(f"Error executing semantic search SQL: {e}")
             raise e
@@ -246,8 +334,36 @@ class NoteService:
             notes.append(note)
 
         logger.info(f"Semantic search found {len(notes)} results")
+        _search_result_cache.set(
+            cache_scope, query_vector, [note.id for note in notes if note.id]
+        )
         return notes
 
+    def _get_ranked_notes(self, user_id: int, note_ids: list[int]) -> list[Note]:
+        """
+        Load a user's unarchived notes by ID, keeping the given order.
+
+        Args:
+            user_id: Owner user ID
+            note_ids: Note IDs in rank order
+
+        Returns:
+            Notes that still exist and are unarchived, in rank order
+        """
+        if not note_ids:
+            return []
+        statement = (
+            select(Note)
+            .options(*_NOTE_LOAD_OPTIONS)
+            .where(
+                Note.id.in_(note_ids),  # type: ignore[union-attr]
+                Note.user_id == user_id,
+                Note.archived == False,  # noqa: E712
+            )
+        )
+        notes_by_id = {note.id: note for note in self.session.exec(statement)}
+        return [notes_by_id[note_id] for note_id in note_ids if note_id in notes_by_id]
+
     async def get_similar_notes(
         self, note_id: int, user_id: int, _user_settings: UserSettings, limit: int = 5
     ) -> list[Note]:
@@ -263,57 +379,74 @@ class NoteService:
         Returns:
             List of similar notes
         """
-        # Get the source note
-        note = self.get_note(note_id, user_id)
-        if not note.embedding:
-            logger.warning(f"Note {note_id} has no embedding for similarity search")
-            return []
+        return [
+            similar_note
+            async for similar_note in self.iter_similar_notes(note_id, user_id, limit)
+        ]
 
-        logger.info(
-            f"Finding similar notes for note {note_id}, embedding size: {len(note.embedding)} bytes"
-        )
+    async def iter_similar_notes(
+        self, note_id: int, user_id: int, limit: int = 5
+    ) -> AsyncIterator[Note]:
+        """
+        Yield notes similar to a given note as rows are read.
+
+        Args:
+            note_id: Source note ID
+            user_id: Owner user ID
+            limit: Maximum results to yield
 
-        # Use the note's embedding for search
+        Yields:
+            Similar notes ordered by relevance
+
+        Raises:
+            NotFoundError: If note not found or doesn't belong to user
+        """
+        # Read the source embedding and rank against it in one statement, so
+        # the source BLOB never round-trips through Python
         sql = text(
             """
-            SELECT id, raw_transcript, summary, tag, processing_status,
-                   error_message, created_at, updated_at, user_id, audio_path, embedding,
-                   vec_distance_cosine(embedding, :query_vec) as distance
-            FROM notes
+            WITH src AS (
+                SELECT embedding FROM notes
+                WHERE id = :note_id AND user_id = :user_id
+            )
+            SELECT notes.id, raw_transcript, summary, tag, processing_status,
+                   error_message, created_at, updated_at, user_id, audio_path,
+                   vec_distance_cosine(notes.embedding, src.embedding) as distance
+            FROM notes, src
             WHERE user_id = :user_id
               AND archived = 0
-              AND embedding IS NOT NULL
-              AND id != :note_id
-              AND length(embedding) = :vec_len
+              AND notes.embedding IS NOT NULL
+              AND notes.id != :note_id
+              AND length(notes.embedding) = length(src.embedding)
             ORDER BY distance ASC
             LIMIT :limit
         """
         )
 
         try:
-            result = self.session.execute(
+            result = await asyncio.to_thread(
+                self.session.execute,
                 sql,
-                {
-                    "query_vec": note.embedding,
-                    "user_id": user_id,
-                    "note_id": note_id,
-                    "limit": limit,
-                    "vec_len": len(note.embedding),
-                },
+                {"user_id": user_id, "note_id": note_id, "limit": limit},
             )
-            rows = result.all()
         except Exception as e:
             logger.error(f"Error executing similar notes SQL: {e}")
             raise e
 
-        # Convert to Note objects
-        notes = []
-        for row in rows:
-            similar_note = Note.model_validate(dict(row._mapping))
-            notes.append(similar_note)
+        # Convert rows to Note objects one at a time
+        count = 0
+        for row in result:
+            count += 1
+            yield Note.model_validate(dict(row._mapping))
 
-        logger.info(f"Found {len(notes)} similar notes for note {note_id}")
-        return notes
+        if not count:
+            # Tell a missing note apart from one with nothing to compare
+            note = self.get_note(note_id, user_id)
+            if not note.embedding:
+                logger.warning(f"Note {note_id} has no embedding for similarity search")
+                return
+
+        logger.info(f"Found {count} similar notes for note {note_id}")
 
     def archive_note(self, note_id: int, user_id: int) -> Note:
         """
@@ -329,13 +462,7 @@ class NoteService:
         Raises:
             NotFoundError: If note not found or doesn't belong to user
         """
-        note = self.get_note(note_id, user_id)
-        note.archived = True
-        note.updated_at = datetime.now(UTC)
-        self.session.add(note)
-        self.session.commit()
-        self.session.refresh(note)
-        return note
+        return self._set_archived(note_id, user_id, archived=True)
 
     def unarchive_note(self, note_id: int, user_id: int) -> Note:
         """
@@ -351,14 +478,141 @@ class NoteService:
         Raises:
             NotFoundError: If note not found or doesn't belong to user
         """
-        note = self.get_note(note_id, user_id)
-        note.archived = False
-        note.updated_at = datetime.now(UTC)
-        self.session.add(note)
+        return self._set_archived(note_id, user_id, archived=False)
+
+    def _update_returning(self, note_id: int, user_id: int, values: dict) -> Note:
+        """
+        Update a note with a single UPDATE ... RETURNING.
+
+        The ownership check is part of the WHERE clause, so no prior SELECT
+        is needed. The returned row is detached before commit so its fresh
+        values are not expired and reloaded on first access.
+
+        Args:
+            note_id: Note ID to update
+            user_id: Owner user ID for verification
+            values: Column values to set
+
+        Returns:
+            Updated Note instance
+
+        Raises:
+            NotFoundError: If note not found or doesn't belong to user
+        """
+        statement = (
+            update(Note)
+            .where(Note.id == note_id, Note.user_id == user_id)  # type: ignore[arg-type]
+            .values(**values)
+            .returning(Note)
+        )
+        note = self.session.scalars(statement).first()
+        if note is None:
+            raise NotFoundError("Note")
+        self.session.expunge(note)
         self.session.commit()
-        self.session.refresh(note)
         return note
 
+    def _set_archived(self, note_id: int, user_id: int, archived: bool) -> Note:
+        """
+        Set a note's archive state.
+
+        Args:
+            note_id: Note ID to update
+            user_id: Owner user ID for verification
+            archived: New archive state
+
+        Returns:
+            Updated Note instance
+
+        Raises:
+            NotFoundError: If note not found or doesn't belong to user
+        """
+        return self._update_returning(
+            note_id, user_id, {"archived": archived, "updated_at": datetime.now(UTC)}
+        )
+
+    def _advanced_conditions(
+        self,
+        user_id: int,
+        search: str | None,
+        tag: str | None,
+        status: str | None,
+        include_archived: bool,
+        archived_only: bool,
+        date_from: datetime | None,
+        date_to: datetime | None,
+    ) -> list:
+        """Build the WHERE conditions shared by the advanced list and count."""
+        conditions: list = [Note.user_id == user_id]
+
+        if archived_only:
+            conditions.append(Note.archived == True)  # noqa: E712
+        elif not include_archived:
+            conditions.append(Note.archived == False)  # noqa: E712
+
+        if tag:
+            conditions.append(Note.tag == tag)
+
+        if status:
+            conditions.append(Note.processing_status == status)
+
+        if search:
+            search_term = f"%{search}%"
+
+            conditions.append(
+                or_(
+                    Note.summary.like(search_term),  # type: ignore[union-attr]
+                    Note.raw_transcript.like(search_term),  # type: ignore[union-attr,attr-defined]
+                )
+            )  # type: ignore[arg-type]
+
+        if date_from:
+            conditions.append(Note.created_at >= date_from)
+
+        if date_to:
+            conditions.append(Note.created_at <= date_to)
+
+        return conditions
+
+    def count_notes_advanced(
+        self,
+        user_id: int,
+        search: str | None = None,
+        tag: str | None = None,
+        status: str | None = None,
+        include_archived: bool = False,
+        archived_only: bool = False,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> int:
+        """
+        Count notes matching the advanced list filters.
+
+        Args:
+            user_id: Owner user ID
+            search: Text search in summary or transcript
+            tag: Filter by tag
+            status: Filter by processing_status
+            include_archived: Include archived notes in the count
+            archived_only: Count only archived notes
+            date_from: Filter by date range start (inclusive)
+            date_to: Filter by date range end (inclusive)
+
+        Returns:
+            Number of matching notes
+        """
+        conditions = self._advanced_conditions(
+            user_id,
+            search,
+            tag,
+            status,
+            include_archived,
+            archived_only,
+            date_from,
+            date_to,
+        )
+        return self.session.exec(select(func.count()).where(*conditions)).one()
+
     def list_notes_advanced(
         self,
         user_id: int,
@@ -377,6 +631,9 @@ class NoteService:
         """
         Advanced list with filters, sorting, and pagination.
 
+        Only the columns the notes table renders are loaded, leaving the
+        embedding BLOB and audio path in the database.
+
         Args:
             user_id: Owner user ID
             search: Text search in summary or transcript
@@ -398,34 +655,16 @@ class NoteService:
         per_page = min(100, max(1, per_page))
         skip = (page - 1) * per_page
 
-        conditions: list = [Note.user_id == user_id]
-
-        if archived_only:
-            conditions.append(Note.archived == True)  # noqa: E712
-        elif not include_archived:
-            conditions.append(Note.archived == False)  # noqa: E712
-
-        if tag:
-            conditions.append(Note.tag == tag)
-
-        if status:
-            conditions.append(Note.processing_status == status)
-
-        if search:
-            search_term = f"%{search}%"
-
-            conditions.append(
-                or_(
-                    Note.summary.like(search_term),  # type: ignore[union-attr]
-                    Note.raw_transcript.like(search_term),  # type: ignore[union-attr,attr-defined]
-                )
-            )  # type: ignore[arg-type]
-
-        if date_from:
-            conditions.append(Note.created_at >= date_from)
-
-        if date_to:
-            conditions.append(Note.created_at <= date_to)
+        conditions = self._advanced_conditions(
+            user_id,
+            search,
+            tag,
+            status,
+            include_archived,
+            archived_only,
+            date_from,
+            date_to,
+        )
 
         count_statement = select(func.count()).where(*conditions)
         total = self.session.exec(count_statement).one()
@@ -447,6 +686,18 @@ class NoteService:
 
         statement = (
             select(Note)
+            .options(
+                load_only(
+                    Note.raw_transcript,  # type: ignore[arg-type]
+                    Note.summary,  # type: ignore[arg-type]
+                    Note.tag,  # type: ignore[arg-type]
+                    Note.processing_status,  # type: ignore[arg-type]
+                    Note.archived,  # type: ignore[arg-type]
+                    Note.created_at,  # type: ignore[arg-type]
+                    Note.updated_at,  # type: ignore[arg-type]
+                ),
+                *_NOTE_LOAD_OPTIONS,
+            )
             .where(*conditions)
             .order_by(sort_attr)
             .offset(skip)
@@ -456,6 +707,47 @@ class NoteService:
         notes = list(self.session.exec(statement).all())
         return notes, total
 
+    def _set_archived_many(
+        self, note_ids: list[int], user_id: int, archived: bool
+    ) -> list[Note]:
+        """
+        Set the archive state of several notes with one UPDATE ... RETURNING.
+
+        IDs that don't exist or belong to another user are skipped.
+
+        Args:
+            note_ids: Note IDs to update
+            user_id: Owner user ID for verification
+            archived: New archive state
+
+        Returns:
+            List of updated Note instances
+        """
+        if not note_ids:
+            return []
+        statement = (
+            update(Note)
+            .where(Note.id.in_(note_ids), Note.user_id == user_id)  # type: ignore[union-attr,arg-type]
+            .values(archived=archived, updated_at=datetime.now(UTC))
+            .returning(Note)
+        )
+        notes = list(self.session.scalars(statement).all())
+        for note in notes:
+            self.session.expunge(note)
+        self.session.commit()
+        self._log_missing(note_ids, {note.id for note in notes}, user_id)
+        return notes
+
+    def _log_missing(
+        self, note_ids: list[int], found_ids: set[int | None], user_id: int
+    ) -> None:
+        """Log requested note IDs that were not found for the user."""
+        for note_id in note_ids:
+            if note_id not in found_ids:
+                logger.warning(
+                    f"Note {note_id} not found or not owned by user {user_id}"
+                )
+
     def bulk_archive_notes(self, note_ids: list[int], user_id: int) -> list[Note]:
         """
         Archive multiple notes.
@@ -467,11 +759,7 @@ class NoteService:
         Returns:
             List of updated Note instances
         """
-        return [
-            self.archive_note(note_id, user_id)
-            for note_id in note_ids
-            if not self._log_note_not_found(note_id, user_id)
-        ]
+        return self._set_archived_many(note_ids, user_id, True)
 
     def bulk_unarchive_notes(self, note_ids: list[int], user_id: int) -> list[Note]:
         """
@@ -484,11 +772,7 @@ class NoteService:
         Returns:
             List of updated Note instances
         """
-        return [
-            self.unarchive_note(note_id, user_id)
-            for note_id in note_ids
-            if not self._log_note_not_found(note_id, user_id)
-        ]
+        return self._set_archived_many(note_ids, user_id, False)
 
     def bulk_delete_notes(self, note_ids: list[int], user_id: int) -> list[int]:
         """
@@ -501,32 +785,25 @@ class NoteService:
         Returns:
             List of deleted note IDs
         """
-        deleted_ids = []
-        for note_id in note_ids:
-            try:
-                self.delete_note(note_id, user_id)
-                deleted_ids.append(note_id)
-            except NotFoundError:
-                logger.warning(
-                    f"Note {note_id} not found or not owned by user {user_id}"
-                )
-                continue
-        return deleted_ids
+        if not note_ids:
+            return []
+        rows = self.session.exec(
+            select(Note.id, Note.audio_path).where(
+                Note.id.in_(note_ids),  # type: ignore[union-attr]
+                Note.user_id == user_id,
+            )
+        ).all()
+        deleted_ids = [note_id for note_id, _ in rows if note_id is not None]
+        self._log_missing(note_ids, set(deleted_ids), user_id)
+        if not deleted_ids:
+            return []
 
-    def _log_note_not_found(self, note_id: int, user_id: int) -> bool:
-        """
-        Check if note exists, log warning if not.
+        for _, audio_path in rows:
+            if audio_path:
+                self._delete_audio_file(Path(audio_path))
 
-        Args:
-            note_id: Note ID to check
-            user_id: Owner user ID
-
-        Returns:
-            True if note not found, False otherwise
-        """
-        try:
-            self.get_note(note_id, user_id)
-            return False
-        except NotFoundError:
-            logger.warning(f"Note {note_id} not found or not owned by user {user_id}")
-            return True
+        self.session.exec(
+            delete(Note).where(Note.id.in_(deleted_ids))  # type: ignore[union-attr,arg-type]
+        )
+        self.session.commit()
+        return deleted_ids
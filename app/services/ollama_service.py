@@ -7,12 +7,55 @@ from typing import TypedDict
 
 import httpx
 import numpy as np
+import orjson
 
 from app.config import settings
 from app.models.note import Note
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# One client for all Ollama calls so connections are kept alive and reused
+# across requests; timeouts and headers are still set per request
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for Ollama requests, creating it on first use.
+
+    Returns:
+        Shared AsyncClient
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=40,
+                keepalive_expiry=30.0,
+            )
+        )
+    return _http_client
+
+
+# Installed models per (base_url, api_key); the list rarely changes
+_models_cache: TTLCache[tuple[str, str | None], list[str]] = TTLCache(
+    maxsize=256, ttl=60
+)
+
+# Reachability per (base_url, api_key), so frequent health probes do not each
+# make a request to Ollama
+_connection_cache: TTLCache[tuple[str, str | None], bool] = TTLCache(maxsize=256, ttl=5)
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client, if one was created."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class SummaryResult(TypedDict):
     """Result from generate_summary_and_tag."""
@@ -61,17 +104,31 @@ class OllamaService:
             True if connected, False otherwise
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/tags",
-                    headers=self._get_headers(),
-                    timeout=5.0,
-                )
-                return response.status_code == 200
+            client = get_http_client()
+            response = await client.get(
+                f"{self.base_url}/api/tags",
+                headers=self._get_headers(),
+                timeout=5.0,
+            )
+            return response.status_code == 200
         except Exception as e:
             logger.warning(f"Ollama connection check failed: {e}")
             return False
 
+    async def check_connection_cached(self) -> bool:
+        """
+        Check if Ollama is reachable, reusing a result from the last few seconds.
+
+        Returns:
+            True if connected, False otherwise
+        """
+        key = (self.base_url, self.api_key)
+        connected = _connection_cache.get(key)
+        if connected is None:
+            connected = await self.check_connection()
+            _connection_cache.set(key, connected)
+        return connected
+
     async def get_available_models(self) -> list[str]:
         """
         Get list of available models from Ollama.
@@ -80,19 +137,36 @@ class OllamaService:
             List of model names
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/api/tags",
-                    headers=self._get_headers(),
-                    timeout=10.0,
-                )
-                response.raise_for_status()
-                data = response.json()
-                return [model["name"] for model in data.get("models", [])]
+            client = get_http_client()
+            response = await client.get(
+                f"{self.base_url}/api/tags",
+                headers=self._get_headers(),
+                timeout=10.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return [model["name"] for model in data.get("models", [])]
         except Exception as e:
             logger.error(f"Failed to get Ollama models: {e}")
             return []
 
+    async def get_available_models_cached(self) -> list[str]:
+        """
+        Get list of available models, reusing a recent result for this server.
+
+        Failed lookups are not cached.
+
+        Returns:
+            List of model names
+        """
+        key = (self.base_url, self.api_key)
+        models = _models_cache.get(key)
+        if models is None:
+            models = await self.get_available_models()
+            if models:
+                _models_cache.set(key, models)
+        return list(models)
+
     async def generate_embedding(self, text: str) -> bytes:
         """
         Generate embedding for text using Ollama.
@@ -103,73 +177,75 @@ class OllamaService:
         Returns:
             Serialized embedding as bytes
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                # Try the newer /api/embed endpoint first
+        client = get_http_client()
+        try:
+            # Try the newer /api/embed endpoint first
+            response = await client.post(
+                f"{self.base_url}/api/embed",
+                headers=self._get_headers(),
+                json={"model": self.embedding_model, "input": text},
+                timeout=60.0,
+            )
+
+            # If /api/embed is not found (404), fallback to legacy /api/embeddings
+            if response.status_code == 404 and "page not found" in response.text:
+                logger.info("Falling back to legacy /api/embeddings endpoint")
                 response = await client.post(
-                    f"{self.base_url}/api/embed",
+                    f"{self.base_url}/api/embeddings",
                     headers=self._get_headers(),
-                    json={"model": self.embedding_model, "input": text},
+                    json={"model": self.embedding_model, "prompt": text},
                     timeout=60.0,
                 )
 
-                # If /api/embed is not found (404), fallback to legacy /api/embeddings
-                if response.status_code == 404 and "page not found" in response.text:
-                    logger.info("Falling back to legacy /api/embeddings endpoint")
-                    response = await client.post(
-                        f"{self.base_url}/api/embeddings",
-                        headers=self._get_headers(),
-                        json={"model": self.embedding_model, "prompt": text},
-                        timeout=60.0,
-                    )
-
-                if response.status_code == 404:
-                    try:
-                        error_data = response.json()
-                        error_msg = error_data.get("error", "")
-                        if "not found" in error_msg.lower():
-                            raise ValueError(
-                                f"Embedding model '{self.embedding_model}' not found in Ollama. "
-                                f"Please run 'ollama pull {self.embedding_model}' or change the model in settings."
-                            )
-                    except (json.JSONDecodeError, ValueError) as e:
-                        if isinstance(e, ValueError):
-                            raise e
-                        pass
-
-                response.raise_for_status()
-                data = response.json()
-                logger.info(f"Ollama response received. Model: {self.embedding_model}")
-
-                # Newer /api/embed returns "embeddings", legacy /api/embeddings returns "embedding"
-                if "embeddings" in data:
-                    embeddings = data.get("embeddings", [[]])
-                    if embeddings and len(embeddings) > 0:
-                        embedding = np.array(embeddings[0], dtype=np.float32)
-                    else:
-                        raise ValueError("No embedding returned from Ollama")
+            if response.status_code == 404:
+                try:
+                    error_data = response.json()
+                    error_msg = error_data.get("error", "")
+                    if "not found" in error_msg.lower():
+                        raise ValueError(
+                            f"Embedding model '{self.embedding_model}' not found in Ollama. "
+                            f"Please run 'ollama pull {self.embedding_model}' or change the model in settings."
+                        )
+                except (json.JSONDecodeError, ValueError) as e:
+                    if isinstance(e, ValueError):
+                        raise e
+                    pass
+
+            response.raise_for_status()
+            # Embedding payloads are large float arrays; orjson parses them
+            # several times faster than the stdlib decoder behind .json()
+            data = orjson.loads(response.content)
+            logger.info(f"Ollama response received. Model: {self.embedding_model}")
+
+            # Newer /api/embed returns "embeddings", legacy /api/embeddings returns "embedding"
+            if "embeddings" in data:
+                embeddings = data.get("embeddings", [[]])
+                if embeddings and len(embeddings) > 0:
+                    embedding = np.array(embeddings[0], dtype=np.float32)
                 else:
-                    embedding_list = data.get("embedding", [])
-                    if embedding_list:
-                        embedding = np.array(embedding_list, dtype=np.float32)
-                    else:
-                        raise ValueError("No embedding returned from Ollama")
-
-                logger.info(
-                    f"Successfully generated embedding: {embedding.shape} {embedding.dtype}"
-                )
-                if embedding.dtype != np.float32:
-                    embedding = embedding.astype(np.float32)
-                return embedding.tobytes()
+                    raise ValueError("No embedding returned from Ollama")
+            else:
+                embedding_list = data.get("embedding", [])
+                if embedding_list:
+                    embedding = np.array(embedding_list, dtype=np.float32)
+                else:
+                    raise ValueError("No embedding returned from Ollama")
 
-            except httpx.HTTPStatusError as e:
-                # Provide a more descriptive error if possible
-                try:
-                    error_json = e.response.json()
-                    error_msg = error_json.get("error", str(e))
-                except Exception:
-                    error_msg = str(e)
-                raise Exception(f"Ollama Error: {error_msg}") from e
+            logger.info(
+                f"Successfully generated embedding: {embedding.shape} {embedding.dtype}"
+            )
+            if embedding.dtype != np.float32:
+                embedding = embedding.astype(np.float32)
+            return embedding.tobytes()
+
+        except httpx.HTTPStatusError as e:
+            # Provide a more descriptive error if possible
+            try:
+                error_json = e.response.json()
+                error_msg = error_json.get("error", str(e))
+            except Exception:
+                error_msg = str(e)
+            raise Exception(f"Ollama Error: {error_msg}") from e
 
     async def generate_summary_and_tag(
         self, transcript: str, available_tags: list[str]
@@ -207,51 +283,51 @@ Transcript: {transcript}
 
 JSON response:"""
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/generate",
-                headers=self._get_headers(),
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json",
-                },
-                timeout=120.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Parse the response
-            response_text = data.get("response", "{}")
-            try:
-                result = json.loads(response_text)
-                timestamp = result.get("timestamp")
-                notification_time = None
-                if timestamp and timestamp != "null":
-                    try:
-                        # Parse ISO format timestamp to datetime (local time)
-                        notification_time = datetime.fromisoformat(timestamp)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Failed to parse timestamp: {timestamp}")
-
-                # Normalize tag to match available tags (case-insensitive)
-                tag = result.get("tag", available_tags[0] if available_tags else None)
-                if tag and available_tags:
-                    tag_lower = tag.lower()
-                    for available_tag in available_tags:
-                        if available_tag.lower() == tag_lower:
-                            tag = available_tag
-                            break
-
-                return {
-                    "summary": result.get("summary", ""),
-                    "tag": tag,
-                    "notification_timestamp": notification_time,
-                }
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to parse LLM response: {response_text}")
-                return {"summary": "", "tag": None, "notification_timestamp": None}
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/api/generate",
+            headers=self._get_headers(),
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False,
+                "format": "json",
+            },
+            timeout=120.0,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        # Parse the response
+        response_text = data.get("response", "{}")
+        try:
+            result = orjson.loads(response_text)
+            timestamp = result.get("timestamp")
+            notification_time = None
+            if timestamp and timestamp != "null":
+                try:
+                    # Parse ISO format timestamp to datetime (local time)
+                    notification_time = datetime.fromisoformat(timestamp)
+                except (ValueError, TypeError):
+                    logger.warning(f"Failed to parse timestamp: {timestamp}")
+
+            # Normalize tag to match available tags (case-insensitive)
+            tag = result.get("tag", available_tags[0] if available_tags else None)
+            if tag and available_tags:
+                tag_lower = tag.lower()
+                for available_tag in available_tags:
+                    if available_tag.lower() == tag_lower:
+                        tag = available_tag
+                        break
+
+            return {
+                "summary": result.get("summary", ""),
+                "tag": tag,
+                "notification_timestamp": notification_time,
+            }
+        except orjson.JSONDecodeError:
+            logger.warning(f"Failed to parse LLM response: {response_text}")
+            return {"summary": "", "tag": None, "notification_timestamp": None}
 
     async def answer_question(self, question: str, context_notes: list[Note]) -> str:
         """
@@ -282,20 +358,20 @@ Question: {question}
 
 Answer:"""
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/api/generate",
-                headers=self._get_headers(),
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                },
-                timeout=120.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", "").strip()
+        client = get_http_client()
+        response = await client.post(
+            f"{self.base_url}/api/generate",
+            headers=self._get_headers(),
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "stream": False,
+            },
+            timeout=120.0,
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data.get("response", "").strip()
 
     async def answer_question_stream(self, question: str, context_notes: list[Note]):
         """
@@ -322,27 +398,27 @@ Question: {question}
 
 Answer:"""
 
-        async with httpx.AsyncClient() as client:
-            async with client.stream(
-                "POST",
-                f"{self.base_url}/api/generate",
-                headers=self._get_headers(),
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": True,
-                },
-                timeout=120.0,
-            ) as response:
-                response.raise_for_status()
-                async for line in response.aiter_lines():
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                        if "response" in data:
-                            yield data["response"]
-                        if data.get("done"):
-                            break
-                    except json.JSONDecodeError:
-                        continue
+        client = get_http_client()
+        async with client.stream(
+            "POST",
+            f"{self.base_url}/api/generate",
+            headers=self._get_headers(),
+            json={
+                "model": self.model,
+                "prompt": prompt,
+                "stream": True,
+            },
+            timeout=120.0,
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                try:
+                    data = orjson.loads(line)
+                    if "response" in data:
+                        yield data["response"]
+                    if data.get("done"):
+                        break
+                except orjson.JSONDecodeError:
+                    continue
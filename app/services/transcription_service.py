@@ -1,5 +1,6 @@
 """Transcription service using MLX-Whisper."""
 
+import threading
 from pathlib import Path
 
 import mlx_whisper
@@ -19,6 +20,9 @@ class TranscriptionService:
         """
         self.model = model or settings.whisper_model
         self._model_path = f"mlx-community/whisper-{self.model}-mlx"
+        # mlx_whisper keeps one loaded model in a process-wide holder; running
+        # uploads one at a time reuses it instead of racing to load copies
+        self._lock = threading.Lock()
 
     def transcribe_file(self, file_path: str | Path) -> str:
         """
@@ -30,10 +34,11 @@ class TranscriptionService:
         Returns:
             Transcribed text
         """
-        result = mlx_whisper.transcribe(
-            str(file_path),
-            path_or_hf_repo=self._model_path,
-        )
+        with self._lock:
+            result = mlx_whisper.transcribe(
+                str(file_path),
+                path_or_hf_repo=self._model_path,
+            )
         return result.get("text", "").strip()
 
 
@@ -14,7 +14,6 @@ from app import scheduler
 from app.services.ollama_service import OllamaService
 from app.services.transcription_service import transcription_service
 from app.tasks.notification_tasks import send_note_notification
-from app.utils import get_custom_tags
 from app.utils.events import event_manager
 
 logger = logging.getLogger(__name__)
@@ -48,14 +47,14 @@ async def _process_note_ai(note: Note, session: Session):
         api_key=user_settings.ollama_api_key,
     )
 
-    available_tags = get_custom_tags(user_settings.custom_tags)
+    available_tags = user_settings.custom_tags_list
 
-    summary_result = await ollama.generate_summary_and_tag(
-        note.raw_transcript, available_tags
+    # Summary and embedding are independent requests, so overlap them
+    summary_result, embedding = await asyncio.gather(
+        ollama.generate_summary_and_tag(note.raw_transcript, available_tags),
+        ollama.generate_embedding(note.raw_transcript),
     )
 
-    embedding = await ollama.generate_embedding(note.raw_transcript)
-
     return {
         "summary": summary_result.get("summary"),
         "tag": summary_result.get("tag"),
@@ -1,6 +1,8 @@
 """Utility modules."""
 
-import json
+from functools import lru_cache
+
+import orjson
 
 from app.utils.auth import (
     create_access_token,
@@ -15,7 +17,8 @@ from app.utils.exceptions import (
     VoiceNotesException,
 )
 
-DEFAULT_TAGS = ["Idea", "Todo", "Work", "Personal", "Reference"]
+# Immutable so no caller can mutate the shared defaults
+DEFAULT_TAGS: tuple[str, ...] = ("Idea", "Todo", "Work", "Personal", "Reference")
 
 __all__ = [
     "create_access_token",
@@ -31,6 +34,15 @@ __all__ = [
 ]
 
 
+@lru_cache(maxsize=1024)
+def _parse_custom_tags(custom_tags_json: str) -> tuple[str, ...]:
+    """Parse a tags JSON string, memoized since users rarely change tags."""
+    try:
+        return tuple(orjson.loads(custom_tags_json))
+    except (orjson.JSONDecodeError, TypeError):
+        return DEFAULT_TAGS
+
+
 def get_custom_tags(custom_tags_json: str) -> list[str]:
     """
     Parse custom tags JSON or return defaults.
@@ -39,9 +51,6 @@ def get_custom_tags(custom_tags_json: str) -> list[str]:
         custom_tags_json: JSON string of tags
 
     Returns:
-        List of tag strings
+        List of tag strings (a fresh copy the caller may modify)
     """
-    try:
-        return json.loads(custom_tags_json)
-    except json.JSONDecodeError:
-        return DEFAULT_TAGS.copy()
+    return list(_parse_custom_tags(custom_tags_json))
@@ -1,6 +1,7 @@
 """Authentication utility functions."""
 
 from datetime import UTC, datetime, timedelta
+from functools import cache
 
 import bcrypt
 from jose import JWTError, jwt
@@ -30,6 +31,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
 
+    bcrypt.checkpw compares the recomputed digest in constant time, so no
+    separate hmac.compare_digest step is needed.
+
     Args:
         plain_password: Plain text password to verify
         hashed_password: Hashed password to compare against
@@ -42,6 +46,20 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+@cache
+def get_dummy_password_hash() -> str:
+    """
+    Get a throwaway bcrypt hash used when a username does not exist.
+
+    Verifying against it costs as much as a real check, so login timing does
+    not reveal which usernames are registered.
+
+    Returns:
+        Hashed password string (computed once per process)
+    """
+    return get_password_hash("scribe-dummy-password")
+
+
 def create_access_token(user_id: int, expires_delta: timedelta | None = None) -> str:
     """
     Create a JWT access token.
@@ -88,7 +106,9 @@ def decode_access_token(token: str) -> TokenData:
         if user_id_str is None:
             raise AuthenticationError("Invalid token payload")
         user_id = int(user_id_str)
-        return TokenData(user_id=user_id)
+        exp = payload.get("exp")
+        expires_at = datetime.fromtimestamp(exp, UTC) if exp is not None else None
+        return TokenData(user_id=user_id, expires_at=expires_at)
     except JWTError as e:
         raise AuthenticationError(f"Token validation failed: {e}")
     except ValueError:
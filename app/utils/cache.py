@@ -0,0 +1,181 @@
+"""In-process TTL caches."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+import numpy as np
+
+
+class TTLCache[K: Hashable, V]:
+    """Thread-safe mapping whose entries expire after a time-to-live.
+
+    When full, the least recently used entry is evicted first.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Default time-to-live for entries, in seconds
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Optional time-to-live overriding the cache default
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The removed value, or None if it was not cached
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored entries (including expired ones)."""
+        return len(self._data)
+
+
+class SimilarityCache[S: Hashable, V]:
+    """
+    Cache looked up by vector similarity rather than exact key.
+
+    Entries are grouped by a scope; a lookup returns the value stored for the
+    most similar vector in the same scope if its cosine similarity reaches
+    the threshold. Each scope keeps its most recent ``maxsize`` entries;
+    scopes are dropped once all their entries have expired.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, threshold: float):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep per scope
+            ttl: Time-to-live for entries, in seconds
+            threshold: Minimum cosine similarity for a hit
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.threshold = threshold
+        self._scopes: dict[S, list[tuple[float, np.ndarray, V]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        """Scale a vector to unit length so dot products are cosines."""
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, scope: S, vector: np.ndarray) -> V | None:
+        """
+        Get the value cached for the closest vector in a scope.
+
+        Args:
+            scope: Scope to search
+            vector: Query vector
+
+        Returns:
+            Cached value, or None if no live entry is similar enough
+        """
+        query = self._normalize(vector)
+        now = time.monotonic()
+        with self._lock:
+            live = [entry for entry in self._scopes.get(scope, []) if entry[0] > now]
+            if live:
+                self._scopes[scope] = live
+            else:
+                self._scopes.pop(scope, None)
+            entries = [entry for entry in live if entry[1].shape == query.shape]
+            if not entries:
+                return None
+            similarities = np.stack([entry[1] for entry in entries]) @ query
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return entries[best][2]
+
+    def set(self, scope: S, vector: np.ndarray, value: V) -> None:
+        """
+        Store a value for a vector.
+
+        Args:
+            scope: Scope to store the entry in
+            vector: Vector the value was computed for
+            value: Value to cache
+        """
+        now = time.monotonic()
+        entry = (now + self.ttl, self._normalize(vector), value)
+        with self._lock:
+            # Sweep every scope so ones that are no longer written to don't
+            # keep their expired entries forever
+            for key in list(self._scopes):
+                live = [e for e in self._scopes[key] if e[0] > now]
+                if live:
+                    self._scopes[key] = live
+                else:
+                    del self._scopes[key]
+            entries = self._scopes.get(scope, [])
+            entries.append(entry)
+            self._scopes[scope] = entries[-self.maxsize :]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._scopes.clear()
+
+    def __len__(self) -> int:
+        """Return the number of stored scopes (including expired ones)."""
+        return len(self._scopes)
@@ -50,5 +50,21 @@ class EventManager:
                 f"[SSE] No active connections for user {user_id} to broadcast '{event_name}'"
             )
 
+    async def broadcast_many(self, user_id: int, event_name: str, data: list[str]):
+        """Broadcast one event per data item as a single write per connection."""
+        if not data:
+            return
+        if user_id in self.user_queues:
+            logger.info(
+                f"[SSE] Broadcasting {len(data)} '{event_name}' events to user {user_id} ({len(self.user_queues[user_id])} connections)"
+            )
+            message = "".join(f"event: {event_name}\ndata: {item}\n\n" for item in data)
+            for queue in self.user_queues[user_id]:
+                await queue.put(message)
+        else:
+            logger.debug(
+                f"[SSE] No active connections for user {user_id} to broadcast '{event_name}'"
+            )
+
 
 event_manager = EventManager()
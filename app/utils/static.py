@@ -0,0 +1,64 @@
+"""Static asset serving with content-versioned URLs."""
+
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qs
+
+from starlette.responses import Response
+from starlette.staticfiles import PathLike, StaticFiles
+from starlette.types import Scope
+
+STATIC_DIR = Path("app/static")
+
+
+@lru_cache(maxsize=64)
+def _file_digest(path: Path, mtime_ns: int) -> str:
+    """Hash a file's contents; the mtime key drops stale digests on edit."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+def static_url(path: str) -> str:
+    """
+    Build a URL for a static asset that changes whenever the file does.
+
+    Args:
+        path: Asset path relative to the static directory
+
+    Returns:
+        URL under /static with a content version query parameter
+    """
+    file_path = STATIC_DIR / path
+    digest = _file_digest(file_path, file_path.stat().st_mtime_ns)
+    return f"/static/{path}?v={digest}"
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that lets browsers keep versioned assets indefinitely.
+
+    Requests made through ``static_url`` carry the file's content version, so
+    responses whose ``v`` parameter matches it are marked immutable. All other
+    requests must revalidate, which the ETag and Last-Modified headers keep
+    cheap.
+    """
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        """Serve a file with a Cache-Control header suited to its URL."""
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        # Only the current content version may be cached forever; stale or
+        # unrelated query strings must not pin an old copy in the browser
+        version = parse_qs(scope["query_string"].decode("latin-1")).get("v")
+        digest = _file_digest(Path(full_path), stat_result.st_mtime_ns)
+        if version == [digest]:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
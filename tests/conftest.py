@@ -8,15 +8,35 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine
 from sqlmodel.pool import StaticPool
 
-from app.api.deps import get_db
+from app.api.deps import _token_cache, _user_cache, get_db
+from app.api.routes.web.notes import _fragment_cache, _table_total_cache
 from app.main import app
 from app.models import Note, User, UserSettings
+from app.services.note_service import _query_embedding_cache, _search_result_cache
+from app.services.ollama_service import (
+    OllamaService,
+    _connection_cache,
+    _models_cache,
+)
 from app.utils.auth import create_access_token, get_password_hash
 
 # Use in-memory SQLite for tests
 TEST_DATABASE_URL = "sqlite://"
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Reset in-process caches so IDs reused across tests stay isolated."""
+    _token_cache.clear()
+    _user_cache.clear()
+    _table_total_cache.clear()
+    _fragment_cache.clear()
+    _query_embedding_cache.clear()
+    _search_result_cache.clear()
+    _models_cache.clear()
+    _connection_cache.clear()
+
+
 @pytest.fixture(name="engine")
 def engine_fixture():
     """Create a test database engine."""
@@ -89,3 +109,25 @@ def test_note_fixture(session: Session, test_user: User) -> Note:
     session.commit()
     session.refresh(note)
     return note
+
+
+class CountingOllama(OllamaService):
+    """OllamaService stand-in that records calls instead of contacting a server."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls: list[str] = []
+
+    async def generate_embedding(self, text: str) -> bytes:
+        self.calls.append(text)
+        return b"\x00" * 8
+
+    async def get_available_models(self) -> list[str]:
+        self.calls.append(self.base_url)
+        return [] if "down" in self.base_url else ["llama3"]
+
+
+@pytest.fixture(name="counting_ollama")
+def counting_ollama_fixture() -> type[CountingOllama]:
+    """Provide the call-recording Ollama service class."""
+    return CountingOllama
@@ -1,7 +1,11 @@
 """Tests for authentication endpoints."""
 
+import pytest
 from fastapi.testclient import TestClient
 
+from app.api.deps import _token_cache, _user_cache
+from app.utils.auth import create_access_token
+
 
 def test_register_user(client: TestClient):
     """Test user registration."""
@@ -71,6 +75,28 @@ def test_login_nonexistent_user(client: TestClient):
     assert response.status_code == 401
 
 
+def test_login_nonexistent_user_runs_bcrypt(client: TestClient, monkeypatch):
+    """Test that unknown usernames still pay for a password check."""
+    from app.api.routes import auth
+    from app.api.routes.web import auth as web_auth
+    from app.utils.auth import get_dummy_password_hash
+
+    checked: list[str] = []
+
+    def record_verify(_password: str, hashed_password: str) -> bool:
+        checked.append(hashed_password)
+        return False
+
+    monkeypatch.setattr(auth, "verify_password", record_verify)
+    monkeypatch.setattr(web_auth, "verify_password", record_verify)
+
+    credentials = {"username": "nonexistent", "password": "password"}
+    assert client.post("/api/auth/login", data=credentials).status_code == 401
+    client.post("/login", data=credentials)
+
+    assert checked == [get_dummy_password_hash()] * 2
+
+
 def test_get_current_user(client: TestClient, auth_headers, test_user):
     """Test getting current user info."""
     response = client.get("/api/auth/me", headers=auth_headers)
@@ -125,3 +151,37 @@ def test_revoke_api_token(client: TestClient, auth_headers):
     # NOTE: The current implementation of ApiToken logic checks DB for api_token match.
     # If revoked (set to None), it won't match "None" against the token string.
     assert response.status_code == 401
+
+
+@pytest.mark.parametrize(
+    ("method", "url", "body"),
+    [
+        ("PATCH", "/api/settings", {"ollama_model": "mistral"}),
+        ("POST", "/api/auth/api-token", None),
+        ("DELETE", "/api/auth/api-token", None),
+    ],
+)
+def test_api_writes_invalidate_cached_cookie_user(
+    client: TestClient, auth_headers, test_user, method, url, body
+):
+    """Test that API writes drop the user cached for cookie sessions."""
+    client.cookies.set("access_token", create_access_token(test_user.id))
+    assert client.get("/settings", follow_redirects=False).status_code == 200
+    assert _user_cache.get(test_user.id) is not None
+
+    response = client.request(method, url, headers=auth_headers, json=body)
+
+    assert response.status_code < 300
+    assert _user_cache.get(test_user.id) is None
+
+
+def test_logout_forgets_cached_token(client: TestClient, test_user):
+    """Test that logging out drops the cookie's cached token and user."""
+    client.cookies.set("access_token", create_access_token(test_user.id))
+    assert client.get("/settings", follow_redirects=False).status_code == 200
+    assert len(_token_cache) == 1
+
+    client.get("/logout", follow_redirects=False)
+
+    assert len(_token_cache) == 0
+    assert _user_cache.get(test_user.id) is None
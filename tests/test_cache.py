@@ -0,0 +1,186 @@
+"""Tests for in-process caching helpers."""
+
+import time
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from app.api.deps import (
+    _token_cache,
+    decode_cookie_token,
+    get_user_settings,
+    invalidate_cached_user,
+    load_user,
+)
+from app.models import User, UserSettings
+from app.utils.auth import create_access_token
+from app.utils.cache import SimilarityCache, TTLCache
+from app.utils.exceptions import AuthenticationError
+from app.utils.static import STATIC_DIR, CachedStaticFiles, static_url
+
+
+def test_ttl_cache_get_set_pop():
+    """Test basic cache operations."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    assert cache.get("a") is None
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    assert cache.pop("a") == 1
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_expiry():
+    """Test that entries expire after their TTL."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the oldest unused entry is evicted when full."""
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_similarity_cache_matches_close_vectors_in_scope():
+    """Test that near-duplicate vectors hit only within their scope."""
+    cache: SimilarityCache[str, str] = SimilarityCache(
+        maxsize=10, ttl=60, threshold=0.95
+    )
+    cache.set("a", np.array([1.0, 0.0], dtype=np.float32), "x")
+
+    assert cache.get("a", np.array([2.0, 0.1], dtype=np.float32)) == "x"
+    assert cache.get("a", np.array([0.0, 1.0], dtype=np.float32)) is None
+    assert cache.get("b", np.array([1.0, 0.0], dtype=np.float32)) is None
+
+
+def test_similarity_cache_drops_expired_scopes():
+    """Test that scopes are removed once all their entries expire."""
+    cache: SimilarityCache[str, str] = SimilarityCache(
+        maxsize=10, ttl=0.01, threshold=0.95
+    )
+    cache.set("a", np.array([1.0, 0.0], dtype=np.float32), "x")
+    time.sleep(0.02)
+
+    cache.set("b", np.array([1.0, 0.0], dtype=np.float32), "y")
+    assert len(cache) == 1
+
+    time.sleep(0.02)
+    assert cache.get("b", np.array([1.0, 0.0], dtype=np.float32)) is None
+    assert len(cache) == 0
+
+
+async def test_ollama_models_are_cached_per_server(counting_ollama):
+    """Test that model lists are reused per server and failures are not."""
+    up = counting_ollama(base_url="http://up")
+    down = counting_ollama(base_url="http://down")
+    for _ in range(2):
+        assert await up.get_available_models_cached() == ["llama3"]
+        assert await down.get_available_models_cached() == []
+
+    assert up.calls == ["http://up"]
+    assert down.calls == ["http://down", "http://down"]
+
+
+def test_cookie_token_is_cached():
+    """Test that decoded cookie tokens are reused."""
+    token = create_access_token(42)
+
+    first = decode_cookie_token(token)
+    second = decode_cookie_token(token)
+
+    assert first.user_id == 42
+    assert second is first
+
+
+def test_cookie_token_cache_rejects_expired_tokens():
+    """Test that expired tokens are rejected and never cached."""
+    token = create_access_token(42, expires_delta=timedelta(seconds=-1))
+
+    with pytest.raises(AuthenticationError):
+        decode_cookie_token(token)
+
+    assert len(_token_cache) == 0
+
+
+def test_cookie_user_is_cached_detached(session, test_user: User):
+    """Test that users are cached as detached copies until invalidated."""
+    user_id = test_user.id
+    assert user_id is not None
+    session.expunge_all()
+
+    first = load_user(session, user_id)
+    second = load_user(session, user_id)
+
+    assert first is not None
+    assert second is first
+    assert first not in session
+
+    invalidate_cached_user(user_id)
+    assert load_user(session, user_id) is not first
+
+
+def test_cookie_user_settings_are_read_fresh(session, test_user: User):
+    """Test that settings changed elsewhere are seen despite the cached user."""
+    user_id = test_user.id
+    assert user_id is not None
+    session.expunge_all()
+    cached = load_user(session, user_id)
+    assert cached is not None
+
+    # Simulate a write handled by another worker, which cannot invalidate ours
+    session.execute(
+        update(UserSettings)
+        .where(UserSettings.user_id == user_id)  # type: ignore[arg-type]
+        .values(ollama_model="mistral")
+    )
+    session.commit()
+
+    assert load_user(session, user_id) is cached
+    assert get_user_settings(session, cached).ollama_model == "mistral"
+
+
+def test_user_settings_are_created_once(session):
+    """Test that a missing settings row is created and then reused."""
+    user = User(username="nosettings", hashed_password="x")
+    session.add(user)
+    session.commit()
+    user_id = user.id
+    assert user_id is not None
+    session.expunge_all()
+    cached = load_user(session, user_id)
+    assert cached is not None
+
+    first = get_user_settings(session, cached)
+    second = get_user_settings(session, cached)
+
+    assert first.user_id == user_id
+    assert second.id == first.id
+
+
+def test_only_current_static_version_is_immutable():
+    """Test that static assets are cached forever only for their own digest."""
+    static_files = CachedStaticFiles(directory=STATIC_DIR)
+    full_path = STATIC_DIR / "js/theme.js"
+    version = static_url("js/theme.js").partition("?")[2]
+
+    def cache_control(query_string: str) -> str:
+        scope = {"type": "http", "headers": [], "query_string": query_string.encode()}
+        response = static_files.file_response(full_path, full_path.stat(), scope)
+        return response.headers["cache-control"]
+
+    assert cache_control(version) == "public, max-age=31536000, immutable"
+    for query_string in ("v=000000000000", "nov=1", ""):
+        assert cache_control(query_string) == "no-cache"
@@ -0,0 +1,23 @@
+"""Tests for database helpers."""
+
+import pytest
+from sqlmodel import Session, select
+
+from app.database import QueryCountMiddleware
+from app.models import Note
+
+
+async def test_query_count_middleware_warns(
+    session: Session, caplog: pytest.LogCaptureFixture
+):
+    """Test that requests running many statements are flagged in debug."""
+
+    async def app(_scope, _receive, _send):
+        for _ in range(3):
+            session.exec(select(Note)).all()
+
+    middleware = QueryCountMiddleware(app, threshold=2)
+    scope = {"type": "http", "method": "GET", "path": "/busy"}
+    await middleware(scope, None, None)  # type: ignore[arg-type]
+
+    assert "GET /busy executed 3 SQL statements" in caplog.text
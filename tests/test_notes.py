@@ -2,6 +2,9 @@
 
 from fastapi.testclient import TestClient
 
+from app.api.routes.web.notes import _stream_template
+from app.utils.auth import create_access_token
+
 
 def test_list_notes_empty(client: TestClient, auth_headers):
     """Test listing notes when empty."""
@@ -131,3 +134,77 @@ def test_pagination(client: TestClient, auth_headers, session, test_user):
     data = response.json()
     assert len(data["notes"]) == 5
     assert data["total"] == 15
+
+
+def test_note_card_revalidates_with_etag(client: TestClient, test_user, test_note):
+    """Test that polled note cards answer 304 while the note is unchanged."""
+    client.cookies.set("access_token", create_access_token(test_user.id))
+
+    first = client.get(f"/web/notes/{test_note.id}/card")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    response = client.get(
+        f"/web/notes/{test_note.id}/card", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    cached = client.get(f"/web/notes/{test_note.id}/card")
+    assert cached.content == first.content
+    assert cached.headers["etag"] == etag
+
+
+def test_bulk_action_parses_note_ids(client: TestClient, session, test_user, test_note):
+    """Test that bulk actions accept loosely formatted ids and cap their count."""
+    from app.models import Note
+
+    note_id = test_note.id
+    client.cookies.set("access_token", create_access_token(test_user.id))
+
+    response = client.post(
+        "/web/notes/table/bulk",
+        data={"note_ids": f" {note_id} , ,", "action": "archive"},
+    )
+    assert response.status_code == 200
+    assert session.get(Note, note_id).archived
+
+    response = client.post(
+        "/web/notes/table/bulk",
+        data={"note_ids": ",".join(["1"] * 10_001), "action": "archive"},
+    )
+    assert response.status_code == 400
+
+
+def test_bulk_action_ignores_malformed_note_ids(
+    client: TestClient, session, test_user, test_note
+):
+    """Test that digits inside malformed tokens are never treated as ids."""
+    from app.models import Note
+
+    note_id = test_note.id
+    client.cookies.set("access_token", create_access_token(test_user.id))
+
+    response = client.post(
+        "/web/notes/table/bulk",
+        data={
+            "note_ids": f"-{note_id},1.{note_id},{note_id}abc{note_id}",
+            "action": "delete",
+        },
+    )
+
+    assert response.status_code == 400
+    assert session.get(Note, note_id) is not None
+
+
+def test_recent_notes_stream_ends_with_error_fragment():
+    """Test that a rendering failure mid-stream still closes with an error."""
+    chunks = list(
+        _stream_template(
+            "components/note_card.html",
+            {"notes": [object()], "total": 1, "show_count": True},
+            "<p>failed</p>",
+        )
+    )
+
+    assert chunks[-1] == "<p>failed</p>"
@@ -106,6 +106,7 @@ def test_list_notes_advanced_filter_by_tag(session, test_user):
     assert total == 1
     assert len(notes) == 1
     assert notes[0].tag == "Work"
+    assert note_service.count_notes_advanced(user_id=test_user.id, tag="Work") == 1
 
 
 def test_list_notes_advanced_archived_filter(session, test_user):
@@ -181,3 +182,84 @@ def test_list_notes_advanced_sorting(session, test_user):
     assert len(notes) == 3
     assert notes[0].summary == "Summary A"
     assert notes[2].summary == "Summary C"
+
+
+def test_list_recent_notes_defers_blobs(session, test_user):
+    """Test recent notes skip archived rows and defer blobs."""
+    from sqlalchemy import inspect
+
+    from app.models import Note
+
+    note_service = NoteService(session)
+    user_id = test_user.id
+    older = Note(
+        user_id=user_id,
+        raw_transcript="Older",
+        embedding=b"\x00" * 16,
+        created_at=datetime(2024, 1, 1, tzinfo=UTC),
+    )
+    newer = Note(
+        user_id=user_id,
+        raw_transcript="Newer",
+        created_at=datetime(2024, 1, 2, tzinfo=UTC),
+    )
+    archived = Note(user_id=user_id, raw_transcript="Archived", archived=True)
+    session.add_all([older, newer, archived])
+    session.commit()
+    session.expunge_all()
+
+    notes, total = note_service.list_recent_notes(user_id)
+    assert total == 2
+    assert [note.raw_transcript for note in notes] == ["Newer", "Older"]
+    assert "embedding" in inspect(notes[1]).unloaded
+
+
+def test_archive_note_checks_ownership(session, test_user, test_note):
+    """Test archiving updates the note and rejects other users' notes."""
+    import pytest
+
+    from app.utils.exceptions import NotFoundError
+
+    note_service = NoteService(session)
+
+    with pytest.raises(NotFoundError):
+        note_service.archive_note(test_note.id, test_user.id + 1)
+
+    note = note_service.archive_note(test_note.id, test_user.id)
+    assert note.archived is True
+
+    note = note_service.unarchive_note(test_note.id, test_user.id)
+    assert note.archived is False
+
+
+def test_bulk_actions_skip_other_users_notes(session, test_user, test_note):
+    """Test bulk archive and delete only touch the user's own notes."""
+    from app.models import Note
+
+    note_service = NoteService(session)
+    note_id = test_note.id
+    missing_id = note_id + 1000
+
+    archived = note_service.bulk_archive_notes([note_id, missing_id], test_user.id)
+    assert [note.id for note in archived] == [note_id]
+    assert archived[0].archived is True
+
+    assert note_service.bulk_delete_notes([note_id], test_user.id + 1) == []
+    assert note_service.bulk_delete_notes([note_id, missing_id], test_user.id) == [
+        note_id
+    ]
+    session.expire_all()
+    assert session.get(Note, note_id) is None
+
+
+def test_parse_table_filters_dates():
+    """Test that table date filters cover whole days and ignore bad input."""
+    from app.api.routes.web.notes import _parse_table_filters
+
+    _, date_from, date_to = _parse_table_filters("active", "2024-01-02", "2024-01-03")
+    assert date_from == datetime(2024, 1, 2, tzinfo=UTC)
+    assert date_to == datetime(2024, 1, 3, 23, 59, 59, tzinfo=UTC)
+
+    _, date_from, date_to = _parse_table_filters("active", "not-a-date", None)
+    assert date_from is None
+    assert date_to is None
@@ -1,7 +1,17 @@
 """Tests for search endpoints."""
 
+import numpy as np
 import pytest
 from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models import Note, User, UserSettings
+from app.services.note_service import (
+    NoteService,
+    _query_embedding_cache,
+    _search_result_cache,
+)
+from app.services.ollama_service import OllamaService
 
 
 def test_search_requires_auth(client: TestClient):
@@ -34,3 +44,47 @@ def test_search_notes(client: TestClient, auth_headers, test_note):
         assert "note" in result
         assert "similarity" in result
         assert 0 <= result["similarity"] <= 1
+
+
+async def test_query_embedding_is_cached(session: Session, counting_ollama):
+    """Test that normalized repeat queries reuse the cached embedding."""
+    note_service = NoteService(session)
+    ollama = counting_ollama()
+
+    first = await note_service.embed_query(ollama, "Python  tips")
+    second = await note_service.embed_query(ollama, " python tips ")
+
+    assert second == first
+    assert ollama.calls == ["Python  tips"]
+
+
+async def test_cached_search_skips_archived_notes(
+    session: Session, test_user: User, test_note: Note
+):
+    """Test that cached search hits re-check notes instead of replaying rows."""
+    user_settings = session.exec(
+        select(UserSettings).where(UserSettings.user_id == test_user.id)
+    ).one()
+    ollama = OllamaService(
+        base_url=user_settings.ollama_url,
+        embedding_model=user_settings.ollama_embedding_model,
+    )
+    query_vector = np.ones(4, dtype=np.float32)
+    _query_embedding_cache.set(
+        (ollama.base_url, ollama.embedding_model, "python"), query_vector.tobytes()
+    )
+    _search_result_cache.set(
+        (test_user.id, ollama.embedding_model, 10), query_vector, [test_note.id]
+    )
+    note_service = NoteService(session)
+
+    results = await note_service.search_notes_semantic(
+        test_user.id, "Python", user_settings
+    )
+    assert [note.id for note in results] == [test_note.id]
+
+    note_service.archive_note(test_note.id, test_user.id)
+    results = await note_service.search_notes_semantic(
+        test_user.id, "Python", user_settings
+    )
+    assert results == []
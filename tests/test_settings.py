@@ -0,0 +1,40 @@
+"""Tests for settings endpoints."""
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.models import User, UserSettings
+from app.utils.auth import create_access_token
+
+
+def _ollama_model(session: Session, user_id: int) -> str:
+    statement = select(UserSettings.ollama_model).where(
+        UserSettings.user_id == user_id
+    )
+    return session.exec(statement).one()
+
+
+def test_web_settings_save_compares_against_database(
+    client: TestClient, session: Session, test_user: User
+):
+    """Test that a save is not skipped because a cached copy looked unchanged."""
+    user_id = test_user.id
+    assert user_id is not None
+    original = _ollama_model(session, user_id)
+    client.cookies.set("access_token", create_access_token(user_id))
+    assert client.get("/settings", follow_redirects=False).status_code == 200
+
+    # Another worker changes the model; this worker's cache is not invalidated
+    session.execute(
+        update(UserSettings)
+        .where(UserSettings.user_id == user_id)  # type: ignore[arg-type]
+        .values(ollama_model="mistral")
+    )
+    session.commit()
+
+    response = client.patch("/web/settings", data={"ollama_model": original})
+
+    assert response.status_code == 200
+    session.expire_all()
+    assert _ollama_model(session, user_id) == original